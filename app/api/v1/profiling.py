@@ -1,5 +1,7 @@
 """User profiling and risk assessment endpoints."""
 from datetime import datetime
+import itertools
+import time
 from typing import List, Dict, Any, Optional
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, Field
@@ -8,6 +10,8 @@ from app.core.logger import get_logger
 router = APIRouter()
 logger = get_logger(__name__)
 
+_profile_ids = itertools.count()
+
 
 class RiskQuestionnaireResponse(BaseModel):
     """Individual response to a risk questionnaire question"""
@@ -93,7 +97,7 @@ async def submit_risk_assessment(questionnaire: RiskQuestionnaire) -> RiskProfil
     investment_horizon = "medium"
     
     profile = RiskProfile(
-        profile_id=f"profile_{datetime.utcnow().timestamp()}",
+        profile_id=f"profile_{time.time_ns()}_{next(_profile_ids)}",
         risk_score=risk_score,
         risk_category=risk_category,
         investment_horizon=investment_horizon,
@@ -1,15 +1,18 @@
 """Task management endpoints for async operations."""
 from typing import Dict, Any, List
 from fastapi import APIRouter, HTTPException, status
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
 from app.core.logger import get_logger
 from app.workers.tasks import (
     run_backtest,
     analyze_trade_with_ai,
     process_webhook,
     batch_analyze_signals,
-    get_task_status
+    get_task_status,
+    load_backtest_result
 )
+from app.models.backtest import BacktestResult
+from app.models.tradingview import TradingViewAlert
 
 router = APIRouter()
 logger = get_logger(__name__)
@@ -92,9 +95,18 @@ async def create_webhook_task(alert_data: Dict[str, Any]) -> TaskResponse:
     
     Returns task ID that can be used to check status.
     """
+    # Validate once here; the task trusts the payload instead of re-parsing it
     try:
-        # Queue the webhook processing task
-        task = process_webhook.delay(alert_data)
+        alert = TradingViewAlert.model_validate(alert_data)
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=e.errors(include_url=False, include_context=False)
+        )
+
+    try:
+        # Queue the webhook processing task, keeping extra keys such as alert_id
+        task = process_webhook.delay({**alert_data, **alert.model_dump(mode="json")})
         
         logger.info("Webhook task created", task_id=task.id)
         
@@ -171,6 +183,22 @@ async def get_task_status_endpoint(task_id: str) -> TaskStatus:
         )
 
 
+@router.get("/tasks/backtest/results/{result_key}", response_model=BacktestResult)
+async def get_backtest_task_result(result_key: str) -> BacktestResult:
+    """
+    Get the full result of a completed backtest task.
+    
+    The key is the result_key returned by the backtest task.
+    """
+    result = load_backtest_result(result_key)
+    if result is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Backtest result not found or expired"
+        )
+    return result
+
+
 @router.delete("/tasks/{task_id}")
 async def cancel_task(task_id: str) -> Dict[str, str]:
     """
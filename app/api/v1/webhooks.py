@@ -107,7 +107,7 @@ async def tradingview_webhook(
             # Queue for async processing
             from app.workers.tasks import process_webhook
             
-            task = process_webhook.delay(alert.model_dump())
+            task = process_webhook.delay(alert.model_dump(mode="json"))
             alert_id = task.id
             
             logger.info("Webhook queued for async processing", task_id=alert_id)
@@ -1,7 +1,35 @@
 """Celery application configuration."""
+import msgpack
 from celery import Celery
+from kombu.serialization import registry
+from kombu.utils.json import JSONEncoder, object_hook
+
 from app.core.config import settings
 
+_json_encoder = JSONEncoder()
+
+
+def _msgpack_dumps(obj):
+    """Pack with msgpack, encoding datetimes, UUIDs etc. the way kombu's JSON does"""
+    return msgpack.packb(obj, use_bin_type=True, default=_json_encoder.default)
+
+
+def _msgpack_loads(data):
+    """Unpack msgpack, restoring the types tagged by _msgpack_dumps"""
+    return msgpack.unpackb(data, raw=False, object_hook=object_hook)
+
+
+# kombu's stock msgpack serializer has no hook for datetime (or pd.Timestamp),
+# which JSON handled. Replace it so task arguments, state meta and results keep
+# working; payloads without tagged types are byte-for-byte the same as before
+registry.register(
+    "msgpack",
+    _msgpack_dumps,
+    _msgpack_loads,
+    content_type="application/x-msgpack",
+    content_encoding="binary",
+)
+
 # Create Celery instance
 celery_app = Celery(
     "algo_trader",
@@ -13,14 +41,18 @@ celery_app = Celery(
 # Configure Celery
 celery_app.conf.update(
     # Task settings
-    task_serializer="json",
+    # OPTIMIZATION: msgpack is more compact and faster to encode than JSON;
+    # JSON is still accepted for messages from older producers
+    task_serializer="msgpack",
+    accept_content=["msgpack", "json"],
     task_track_started=True,
     task_time_limit=30 * 60,  # 30 minutes
     task_soft_time_limit=25 * 60,  # 25 minutes
     task_acks_late=True,
     
     # Result settings
-    result_serializer="json",
+    result_serializer="msgpack",
+    result_accept_content=["msgpack", "json"],
     result_backend=settings.celery_result_backend,
     result_expires=3600,  # 1 hour
     
@@ -0,0 +1,5 @@
+"""Python version compatibility helpers."""
+import sys
+
+# Slotted dataclasses drop the per-instance __dict__; slots= needs Python 3.10+
+DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
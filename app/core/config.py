@@ -67,6 +67,16 @@ class Settings(BaseSettings):
     ai_temperature: float = Field(default=0.7, ge=0.0, le=1.0)
     enable_ai_analysis: bool = Field(default=True)
 
+    # AI webhook queue (internal tuning, not user-facing)
+    ai_webhook_workers: int = Field(default=4, ge=1)
+    ai_webhook_batch_ms: int = Field(default=50, ge=0)
+    ai_webhook_batch_max: int = Field(default=10, ge=1)
+    ai_webhook_queue_size: int = Field(default=1000, ge=1)
+
+    # Redis hot cache TTLs (seconds)
+    market_context_cache_ttl: int = Field(default=60, ge=1)
+    ai_analysis_cache_ttl: int = Field(default=30, ge=1)
+
     model_config = SettingsConfigDict(
         env_file=".env", env_file_encoding="utf-8", case_sensitive=False
     )
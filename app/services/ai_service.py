@@ -1,7 +1,8 @@
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Union
 from datetime import datetime
+import asyncio
 import json
-from anthropic import Anthropic
+from anthropic import AsyncAnthropic
 from app.core.config import settings
 from app.core.logger import LoggerMixin
 from app.core.errors import AlgoTraderError
@@ -23,7 +24,9 @@ class AIService(LoggerMixin):
         if not settings.anthropic_api_key:
             raise AIAnalysisError("Anthropic API key not configured")
 
-        self.client = Anthropic(api_key=settings.anthropic_api_key)
+        # Async client, so requests don't block the event loop (and the AI
+        # webhook queue workers running on it) for a whole round-trip
+        self.client = AsyncAnthropic(api_key=settings.anthropic_api_key)
         self.model = settings.claude_model
 
     async def analyze_trade_signal(
@@ -54,7 +57,7 @@ Please analyze:
 
 Provide your analysis in JSON format with keys: signal_strength, risk_reward, market_alignment, recommendations, confidence, reasoning."""
 
-            response = self.client.messages.create(
+            response = await self.client.messages.create(
                 model=self.model,
                 max_tokens=settings.ai_max_tokens,
                 temperature=settings.ai_temperature,
@@ -76,6 +79,94 @@ Provide your analysis in JSON format with keys: signal_strength, risk_reward, ma
             self.log_error(f"AI analysis failed: {str(e)}")
             raise AIAnalysisError(f"Failed to analyze trade signal: {str(e)}")
 
+    async def analyze_trade_signal_batch(
+        self,
+        alerts: List[TradingViewAlert],
+        market_contexts: Optional[List[Optional[Dict[str, Any]]]] = None,
+    ) -> List[Union[Dict[str, Any], AIAnalysisError]]:
+        """
+        Analyze several trading signals with a single Claude request
+
+        Analyses come back in the order of alerts. If the batch response is
+        malformed or has the wrong number of entries, the affected signals are
+        analyzed one request each instead; a signal that still can't be
+        analyzed gets its AIAnalysisError in its slot, so one bad entry
+        doesn't fail the others.
+        """
+        contexts = market_contexts or [None] * len(alerts)
+
+        if len(alerts) == 1:
+            return [await self.analyze_trade_signal(alerts[0], contexts[0])]
+
+        try:
+            signals = [
+                {
+                    "strategy": alert.strategy,
+                    "symbol": alert.symbol,
+                    "signal": alert.signal,
+                    "price": alert.price,
+                    "quantity": alert.quantity,
+                    "stop_loss": alert.stop_loss,
+                    "take_profit": alert.take_profit,
+                    "market_context": context,
+                }
+                for alert, context in zip(alerts, contexts)
+            ]
+
+            prompt = f"""You are an expert algorithmic trading analyst. Analyze each of these trading signals and provide recommendations.
+
+Trading Signals:
+{json.dumps(signals, indent=2)}
+
+For each signal, analyze:
+1. Signal validity and strength
+2. Risk/reward ratio
+3. Market conditions alignment
+4. Recommended adjustments (if any)
+5. Confidence level (0-100%)
+
+Provide your analysis as a JSON array with one object per signal, in the same order as the signals above. Each object must have keys: signal_strength, risk_reward, market_alignment, recommendations, confidence, reasoning."""
+
+            response = await self.client.messages.create(
+                model=self.model,
+                max_tokens=settings.ai_max_tokens,
+                temperature=settings.ai_temperature,
+                messages=[{"role": "user", "content": prompt}],
+            )
+
+        except Exception as e:
+            self.log_error(f"AI batch analysis failed: {str(e)}")
+            raise AIAnalysisError(f"Failed to analyze trade signals: {str(e)}")
+
+        try:
+            analyses = self._parse_json_array_response(response.content[0].text)
+            if len(analyses) != len(alerts):
+                raise AIAnalysisError(
+                    f"Expected {len(alerts)} analyses, got {len(analyses)}"
+                )
+        except AIAnalysisError as e:
+            # Entries can't be matched to signals; analyze each one on its own
+            self.log_warning(f"AI batch response unusable, analyzing per signal: {e}")
+            analyses = [None] * len(alerts)
+
+        retry = [i for i, item in enumerate(analyses) if not isinstance(item, dict)]
+        if retry:
+            fallback = await asyncio.gather(
+                *(self.analyze_trade_signal(alerts[i], contexts[i]) for i in retry),
+                return_exceptions=True,
+            )
+            # analyze_trade_signal only raises AIAnalysisError
+            for i, analysis in zip(retry, fallback):
+                analyses[i] = analysis
+
+        self.log_event(
+            "AI batch trade signal analysis completed",
+            batch_size=len(alerts),
+            fallbacks=len(retry),
+        )
+
+        return analyses
+
     async def analyze_backtest_results(
         self, backtest_result: BacktestResult
     ) -> Dict[str, Any]:
@@ -108,7 +199,7 @@ Please provide:
 
 Format your response as JSON with keys: assessment, strengths, weaknesses, risk_analysis, improvements, market_conditions, parameter_suggestions."""
 
-            response = self.client.messages.create(
+            response = await self.client.messages.create(
                 model=self.model,
                 max_tokens=settings.ai_max_tokens,
                 temperature=settings.ai_temperature,
@@ -167,7 +258,7 @@ Generate a 2-3 paragraph commentary covering:
 
 Keep it professional, actionable, and under 200 words."""
 
-            response = self.client.messages.create(
+            response = await self.client.messages.create(
                 model=self.model,
                 max_tokens=500,
                 temperature=0.7,
@@ -215,7 +306,7 @@ Assess:
 
 Provide response as JSON with keys: position_size_assessment, stop_loss_assessment, take_profit_assessment, risk_rating, recommendations, approved (boolean)."""
 
-            response = self.client.messages.create(
+            response = await self.client.messages.create(
                 model=self.model,
                 max_tokens=1000,
                 temperature=0.3,  # Lower temperature for risk assessment
@@ -261,7 +352,7 @@ Based on the performance data:
 
 Provide response as JSON with keys: pattern_analysis, suggested_parameters, reasoning, expected_improvement_percent."""
 
-            response = self.client.messages.create(
+            response = await self.client.messages.create(
                 model=self.model,
                 max_tokens=settings.ai_max_tokens,
                 temperature=0.5,
@@ -296,6 +387,21 @@ Provide response as JSON with keys: pattern_analysis, suggested_parameters, reas
                 "raw_response": text[:500],  # First 500 chars
             }
 
+    def _parse_json_array_response(self, text: str) -> List[Dict[str, Any]]:
+        """Parse a JSON array from Claude's response"""
+        import re
+
+        json_match = re.search(r"\[[\s\S]*\]", text)
+        try:
+            parsed = json.loads(json_match.group() if json_match else text)
+        except json.JSONDecodeError:
+            raise AIAnalysisError("Failed to parse JSON array from AI response")
+
+        if not isinstance(parsed, list):
+            raise AIAnalysisError("AI response is not a JSON array")
+
+        return parsed
+
 
 # Global AI service instance
 ai_service = None
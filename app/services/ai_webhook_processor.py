@@ -1,8 +1,13 @@
-from typing import Dict, Any, Optional
+import asyncio
+import json
+import threading
+import time
+from typing import Dict, Any, List, Optional, Tuple, Union
+import redis.asyncio as redis
 from app.core.logger import LoggerMixin
 from app.core.config import settings
 from app.models.tradingview import TradingViewAlert, SignalType
-from app.services.ai_service import get_ai_service, AIAnalysisError
+from app.services.ai_service import AIService, get_ai_service, AIAnalysisError
 from app.services.strategies.ai_enhanced_strategy import (
     AIEnhancedStrategy,
     AIEnhancedStrategyParameters,
@@ -15,8 +20,137 @@ class AIWebhookProcessor(LoggerMixin):
     before execution
     """
 
-    def __init__(self):
-        self.ai_service = get_ai_service() if settings.enable_ai_analysis else None
+    # AI service shared by all processors, resolved on first construction
+    _shared_ai_service: Optional[AIService] = None
+    _ai_service_resolved = False
+
+    def __init__(self, redis_client: Optional[redis.Redis] = None):
+        self.ai_service = self._get_shared_ai_service()
+        if redis_client is None and settings.redis_url:
+            redis_client = redis.from_url(settings.redis_url, decode_responses=True)
+        self.redis = redis_client
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+
+    @classmethod
+    def _get_shared_ai_service(cls) -> Optional[AIService]:
+        """Resolve the AI service once for every processor instance"""
+        if not cls._ai_service_resolved:
+            cls._shared_ai_service = (
+                get_ai_service() if settings.enable_ai_analysis else None
+            )
+            cls._ai_service_resolved = True
+        return cls._shared_ai_service
+
+    async def enqueue(
+        self, alert: TradingViewAlert, account_balance: float = 100000.0
+    ) -> "asyncio.Future[Dict[str, Any]]":
+        """
+        Queue a webhook signal for batched AI processing
+
+        Returns immediately with a future that resolves to the same result
+        dict as process_webhook_with_ai, so the webhook can be acknowledged
+        without waiting on the AI round-trips.
+        """
+        self._start_workers()
+        queue = self._queue
+        future = asyncio.get_running_loop().create_future()
+        await queue.put((alert, account_balance, future))
+        if queue is not self._queue:
+            # stop() ran while we waited for room; nobody will drain this queue
+            future.cancel()
+        return future
+
+    async def stop(self) -> None:
+        """Cancel the queue workers and every alert still waiting on them"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+        # Workers cancel their in-flight batch; resolve what is still queued
+        queue, self._queue = self._queue, None
+        while queue is not None and not queue.empty():
+            _, _, future = queue.get_nowait()
+            future.cancel()
+
+    def _start_workers(self) -> None:
+        """Lazily create the queue and worker pool on the running loop"""
+        if self._workers:
+            return
+
+        self._queue = asyncio.Queue(maxsize=settings.ai_webhook_queue_size)
+        self._workers = [
+            asyncio.create_task(self._worker())
+            for _ in range(settings.ai_webhook_workers)
+        ]
+
+    async def _worker(self) -> None:
+        """Pull queued alerts in batches and process them together"""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = []
+            try:
+                batch.append(await self._queue.get())
+                deadline = loop.time() + settings.ai_webhook_batch_ms / 1000
+
+                # Coalesce whatever arrives within the batch window
+                while len(batch) < settings.ai_webhook_batch_max:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(
+                            await asyncio.wait_for(self._queue.get(), timeout)
+                        )
+                    except asyncio.TimeoutError:
+                        break
+
+                try:
+                    await self._process_batch(batch)
+                except Exception as e:
+                    self.log_error(f"AI webhook batch failed: {e}")
+                    for _, _, future in batch:
+                        if not future.done():
+                            future.set_exception(e)
+            except asyncio.CancelledError:
+                # Shutting down: don't leave callers awaiting this batch forever
+                for _, _, future in batch:
+                    future.cancel()
+                raise
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _process_batch(
+        self, batch: List[Tuple[TradingViewAlert, float, asyncio.Future]]
+    ) -> None:
+        """Analyze a batch of alerts with one AI request and resolve futures"""
+        alerts = [alert for alert, _, _ in batch]
+        results = [self._initial_result(alert) for alert in alerts]
+
+        if not self.ai_service:
+            self.log_warning("AI service not available, processing without AI")
+        else:
+            try:
+                ai_analyses = await self._analyze_alerts(alerts)
+            except AIAnalysisError as e:
+                for result in results:
+                    self._handle_ai_failure(result, e)
+            else:
+                await asyncio.gather(
+                    *(
+                        self._apply_ai_analysis_safely(result, alert, analysis, balance)
+                        for result, (alert, balance, _), analysis in zip(
+                            results, batch, ai_analyses
+                        )
+                    )
+                )
+
+        for result, (_, _, future) in zip(results, batch):
+            if not future.done():
+                future.set_result(result)
 
     async def process_webhook_with_ai(
         self, alert: TradingViewAlert, account_balance: float = 100000.0
@@ -32,12 +166,7 @@ class AIWebhookProcessor(LoggerMixin):
             - risk_assessment: Dict with risk metrics
         """
 
-        result = {
-            "should_execute": True,
-            "ai_analysis": None,
-            "modified_alert": alert,
-            "risk_assessment": None,
-        }
+        result = self._initial_result(alert)
 
         if not self.ai_service:
             self.log_warning("AI service not available, processing without AI")
@@ -45,62 +174,166 @@ class AIWebhookProcessor(LoggerMixin):
 
         try:
             # 1. Get AI trade analysis
-            market_context = await self._gather_market_context(alert.symbol)
-            ai_analysis = await self.ai_service.analyze_trade_signal(
-                alert, market_context
+            ai_analysis = (await self._analyze_alerts([alert]))[0]
+            await self._apply_ai_analysis(result, alert, ai_analysis, account_balance)
+
+        except AIAnalysisError as e:
+            self._handle_ai_failure(result, e)
+
+        return result
+
+    def _initial_result(self, alert: TradingViewAlert) -> Dict[str, Any]:
+        """Default result for an alert that has not been analyzed yet"""
+        return {
+            "should_execute": True,
+            "ai_analysis": None,
+            "modified_alert": alert,
+            "risk_assessment": None,
+        }
+
+    def _handle_ai_failure(self, result: Dict[str, Any], error: Exception) -> None:
+        """Record an AI failure on the result"""
+        self.log_error(f"AI analysis failed: {error}")
+        # On AI failure, we can choose to proceed with original signal
+        # or reject it based on configuration
+        result["should_execute"] = getattr(settings, "allow_trades_without_ai", True)
+
+    async def _apply_ai_analysis(
+        self,
+        result: Dict[str, Any],
+        alert: TradingViewAlert,
+        ai_analysis: Dict[str, Any],
+        account_balance: float,
+    ) -> None:
+        """Apply an AI trade analysis to the result for a single alert"""
+        result["ai_analysis"] = ai_analysis
+
+        # 2. Check if AI approves the trade
+        ai_confidence = ai_analysis.get("confidence", 0)
+        if ai_confidence < 50:  # Below 50% confidence, reject
+            result["should_execute"] = False
+            self.log_warning(
+                f"AI rejected trade due to low confidence: {ai_confidence}%",
+                symbol=alert.symbol,
+                signal=alert.signal,
             )
-            result["ai_analysis"] = ai_analysis
+            return
+
+        # 3. Perform risk assessment if we have position details
+        if alert.quantity and alert.stop_loss:
+            risk_assessment = await self._assess_trade_risk(alert, account_balance)
+            result["risk_assessment"] = risk_assessment
 
-            # 2. Check if AI approves the trade
-            ai_confidence = ai_analysis.get("confidence", 0)
-            if ai_confidence < 50:  # Below 50% confidence, reject
+            if not risk_assessment.get("approved", False):
                 result["should_execute"] = False
                 self.log_warning(
-                    f"AI rejected trade due to low confidence: {ai_confidence}%",
+                    "AI rejected trade due to risk assessment",
                     symbol=alert.symbol,
-                    signal=alert.signal,
+                    risk_rating=risk_assessment.get("risk_rating"),
                 )
-                return result
-
-            # 3. Perform risk assessment if we have position details
-            if alert.quantity and alert.stop_loss:
-                risk_assessment = await self._assess_trade_risk(alert, account_balance)
-                result["risk_assessment"] = risk_assessment
-
-                if not risk_assessment.get("approved", False):
-                    result["should_execute"] = False
-                    self.log_warning(
-                        "AI rejected trade due to risk assessment",
-                        symbol=alert.symbol,
-                        risk_rating=risk_assessment.get("risk_rating"),
-                    )
-                    return result
+                return
 
-            # 4. Apply AI recommendations to modify the alert
-            modified_alert = self._apply_ai_recommendations(
-                alert, ai_analysis, result.get("risk_assessment")
-            )
-            result["modified_alert"] = modified_alert
+        # 4. Apply AI recommendations to modify the alert
+        modified_alert = self._apply_ai_recommendations(
+            alert, ai_analysis, result.get("risk_assessment")
+        )
+        result["modified_alert"] = modified_alert
+
+        # 5. Log successful AI processing
+        self.log_event(
+            "AI webhook processing completed",
+            symbol=alert.symbol,
+            signal=alert.signal,
+            ai_confidence=ai_confidence,
+            modifications_made=modified_alert != alert,
+        )
 
-            # 5. Log successful AI processing
-            self.log_event(
-                "AI webhook processing completed",
-                symbol=alert.symbol,
-                signal=alert.signal,
-                ai_confidence=ai_confidence,
-                modifications_made=modified_alert != alert,
+    async def _apply_ai_analysis_safely(
+        self,
+        result: Dict[str, Any],
+        alert: TradingViewAlert,
+        ai_analysis: Union[Dict[str, Any], AIAnalysisError],
+        account_balance: float,
+    ) -> None:
+        """Apply an AI analysis, recording failures on this alert only"""
+        if isinstance(ai_analysis, AIAnalysisError):
+            # The batch could not analyze this alert
+            self._handle_ai_failure(result, ai_analysis)
+            return
+        try:
+            await self._apply_ai_analysis(result, alert, ai_analysis, account_balance)
+        except AIAnalysisError as e:
+            self._handle_ai_failure(result, e)
+
+    async def _analyze_alerts(
+        self, alerts: List[TradingViewAlert]
+    ) -> List[Union[Dict[str, Any], AIAnalysisError]]:
+        """
+        Get AI trade analyses for alerts, serving repeats from the cache
+
+        Identical alerts retriggered within the same minute reuse the cached
+        analysis; only the misses are sent to the AI service, in one batch.
+        Alerts the batch could not analyze get an AIAnalysisError, which is
+        not cached.
+        """
+        keys = [self._analysis_cache_key(alert) for alert in alerts]
+        analyses = await asyncio.gather(*(self._cache_get(key) for key in keys))
+
+        misses = [i for i, analysis in enumerate(analyses) if analysis is None]
+        if misses:
+            missed_alerts = [alerts[i] for i in misses]
+            market_contexts = await asyncio.gather(
+                *(self._gather_market_context(alert.symbol) for alert in missed_alerts)
             )
+            fresh = await self.ai_service.analyze_trade_signal_batch(
+                missed_alerts, market_contexts
+            )
+            for i, analysis in zip(misses, fresh):
+                analyses[i] = analysis
+                if not isinstance(analysis, AIAnalysisError):
+                    await self._cache_set(
+                        keys[i], analysis, settings.ai_analysis_cache_ttl
+                    )
 
-        except AIAnalysisError as e:
-            self.log_error(f"AI analysis failed: {e}")
-            # On AI failure, we can choose to proceed with original signal
-            # or reject it based on configuration
-            result["should_execute"] = settings.get("allow_trades_without_ai", True)
+        return analyses
 
-        return result
+    def _analysis_cache_key(self, alert: TradingViewAlert) -> str:
+        """Cache key for an alert's AI analysis, bucketed per minute"""
+        price = round(alert.price, 4) if alert.price else None
+        bucket = int(time.time() // 60)
+        return f"shared:ai_analysis:{alert.symbol}:{alert.signal}:{price}:{bucket}"
+
+    async def _cache_get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Read a JSON value from Redis, treating errors as a miss"""
+        if not self.redis:
+            return None
+        try:
+            cached = await self.redis.get(key)
+        except (redis.RedisError, OSError) as e:
+            self.log_warning("Redis cache read failed", key=key, error=str(e))
+            return None
+        return json.loads(cached) if cached else None
+
+    async def _cache_set(self, key: str, value: Dict[str, Any], ttl: int) -> None:
+        """Write a JSON value to Redis with a TTL, ignoring errors"""
+        if not self.redis:
+            return
+        try:
+            await self.redis.setex(key, ttl, json.dumps(value, default=str))
+        except (redis.RedisError, OSError) as e:
+            self.log_warning("Redis cache write failed", key=key, error=str(e))
 
     async def _gather_market_context(self, symbol: str) -> Dict[str, Any]:
-        """Gather market context for AI analysis"""
+        """Gather market context for AI analysis, cached per symbol"""
+        key = f"shared:market:{symbol}"
+        context = await self._cache_get(key)
+        if context is None:
+            context = await self._fetch_market_context(symbol)
+            await self._cache_set(key, context, settings.market_context_cache_ttl)
+        return context
+
+    async def _fetch_market_context(self, symbol: str) -> Dict[str, Any]:
+        """Fetch market context from the upstream data source"""
         # In production, this would fetch real market data
         # For now, return mock context
         return {
@@ -141,64 +374,84 @@ class AIWebhookProcessor(LoggerMixin):
         risk_assessment: Optional[Dict[str, Any]],
     ) -> TradingViewAlert:
         """Apply AI recommendations to modify the alert"""
-        modified_alert = alert.copy()
-
         recommendations = ai_analysis.get("recommendations", [])
 
-        for rec in recommendations:
-            rec_lower = rec.lower()
+        # Work on local copies of the adjustable fields and build the
+        # modified alert once at the end
+        price = alert.price
+        quantity = alert.quantity
+        stop_loss = alert.stop_loss
+        take_profit = alert.take_profit
 
+        for rec_lower in [rec.lower() for rec in recommendations]:
             # Adjust position size
-            if "reduce position" in rec_lower and modified_alert.quantity:
+            if "reduce position" in rec_lower and quantity:
                 reduction_factor = 0.8  # Reduce by 20%
-                modified_alert.quantity *= reduction_factor
+                quantity *= reduction_factor
                 self.log_event("AI reduced position size", factor=reduction_factor)
 
             # Tighten stop loss
-            elif "tighten stop" in rec_lower and modified_alert.stop_loss:
-                if modified_alert.signal == SignalType.BUY:
+            elif "tighten stop" in rec_lower and stop_loss:
+                if alert.signal == SignalType.BUY:
                     # Move stop loss closer (reduce risk)
-                    distance = modified_alert.price - modified_alert.stop_loss
-                    modified_alert.stop_loss = modified_alert.price - (distance * 0.8)
-                elif modified_alert.signal == SignalType.SELL:
-                    distance = modified_alert.stop_loss - modified_alert.price
-                    modified_alert.stop_loss = modified_alert.price + (distance * 0.8)
+                    distance = price - stop_loss
+                    stop_loss = price - (distance * 0.8)
+                elif alert.signal == SignalType.SELL:
+                    distance = stop_loss - price
+                    stop_loss = price + (distance * 0.8)
                 self.log_event("AI tightened stop loss")
 
             # Adjust take profit
-            elif "extend target" in rec_lower and modified_alert.take_profit:
-                if modified_alert.signal == SignalType.BUY:
-                    distance = modified_alert.take_profit - modified_alert.price
-                    modified_alert.take_profit = modified_alert.price + (distance * 1.2)
-                elif modified_alert.signal == SignalType.SELL:
-                    distance = modified_alert.price - modified_alert.take_profit
-                    modified_alert.take_profit = modified_alert.price - (distance * 1.2)
+            elif "extend target" in rec_lower and take_profit:
+                if alert.signal == SignalType.BUY:
+                    distance = take_profit - price
+                    take_profit = price + (distance * 1.2)
+                elif alert.signal == SignalType.SELL:
+                    distance = price - take_profit
+                    take_profit = price - (distance * 1.2)
                 self.log_event("AI extended take profit target")
 
         # Apply risk assessment modifications
         if risk_assessment and risk_assessment.get("risk_rating") == "HIGH":
-            if modified_alert.quantity:
-                modified_alert.quantity *= 0.5  # Halve position for high risk
+            if quantity:
+                quantity *= 0.5  # Halve position for high risk
                 self.log_event("AI halved position due to high risk")
 
-        # Add AI metadata
-        if not modified_alert.metadata:
-            modified_alert.metadata = {}
-
-        modified_alert.metadata["ai_processed"] = True
-        modified_alert.metadata["ai_confidence"] = ai_analysis.get("confidence")
-        modified_alert.metadata["ai_modifications"] = recommendations
+        # Add AI metadata without mutating the original alert's dict
+        metadata = {
+            **(alert.metadata or {}),
+            "ai_processed": True,
+            "ai_confidence": ai_analysis.get("confidence"),
+            "ai_modifications": recommendations,
+        }
 
-        return modified_alert
+        # Shallow copy with the updated fields; no re-validation needed
+        return alert.model_copy(
+            update={
+                "quantity": quantity,
+                "stop_loss": stop_loss,
+                "take_profit": take_profit,
+                "metadata": metadata,
+            }
+        )
 
 
 # Global processor instance
 ai_webhook_processor = None
+_ai_webhook_processor_lock = threading.Lock()
 
 
 def get_ai_webhook_processor() -> AIWebhookProcessor:
     """Get or create AI webhook processor instance"""
     global ai_webhook_processor
     if ai_webhook_processor is None:
-        ai_webhook_processor = AIWebhookProcessor()
+        with _ai_webhook_processor_lock:
+            if ai_webhook_processor is None:
+                ai_webhook_processor = AIWebhookProcessor()
     return ai_webhook_processor
+
+
+async def shutdown_ai_webhook_processor() -> None:
+    """Stop the AI webhook processor's queue workers, if it was created"""
+    if ai_webhook_processor is not None:
+        await ai_webhook_processor.stop()
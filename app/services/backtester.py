@@ -1,6 +1,14 @@
+import asyncio
+import copy
+import importlib
+import os
+import threading
 import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional, Type
+from functools import lru_cache
+from typing import Dict, Any, Hashable, List, Optional, Tuple, Type
 import pandas as pd
 import numpy as np
 from app.core.logger import LoggerMixin, trading_logger
@@ -20,6 +28,131 @@ from app.services.strategies.ema_crossover import (
 )
 
 
+def compute_drawdown(equity: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Return the running peak and fractional drawdown of an equity curve"""
+    peak = np.maximum.accumulate(equity)
+    drawdown = np.subtract(equity, peak)
+    np.divide(drawdown, peak, out=drawdown)
+    return peak, drawdown
+
+
+def compute_return_stats(equity: np.ndarray) -> Tuple[float, float, float]:
+    """
+    Return the mean, standard deviation and downside deviation of bar returns
+
+    Deviations use ddof=1 to match pandas; a deviation that cannot be
+    estimated (fewer than two samples) is reported as 0.
+    """
+    if equity.size < 3:
+        return 0.0, 0.0, 0.0
+
+    returns = np.diff(equity)
+    returns /= equity[:-1]
+
+    downside = returns[returns < 0]
+    downside_std = float(downside.std(ddof=1)) if downside.size > 1 else 0.0
+
+    return float(returns.mean()), float(returns.std(ddof=1)), downside_std
+
+
+def _ema_crossover_parameters(
+    symbol: str, strategy_params: Dict[str, Any]
+) -> EMACrossoverParameters:
+    """Build EMA crossover parameters, memoized for parameter sweeps"""
+    # Sorted so keyword order doesn't split the cache
+    key = tuple(sorted(strategy_params.items()))
+    try:
+        hash(key)
+    except TypeError:
+        # Unhashable parameter values can't be cached; build fresh parameters
+        return _build_ema_crossover_parameters(symbol, key)
+    # Each strategy gets its own copy, so one mutating its parameters can't
+    # change the others built from the same settings
+    return copy.copy(_cached_ema_crossover_parameters(symbol, key))
+
+
+def _build_ema_crossover_parameters(
+    symbol: str, strategy_params: Tuple[Tuple[str, Any], ...]
+) -> EMACrossoverParameters:
+    """Create EMA crossover parameters from normalized strategy params"""
+    return EMACrossoverParameters(
+        symbol=symbol,
+        timeframe="1h",  # TODO: Make configurable
+        lookback_period=100,
+        **dict(strategy_params),
+    )
+
+
+_cached_ema_crossover_parameters = lru_cache(maxsize=128)(
+    _build_ema_crossover_parameters
+)
+
+
+class _TradeBuffer:
+    """Preallocated column storage for the closed trades of a backtest"""
+
+    EXIT_REASONS = ("signal", "stop_loss", "end_of_data")
+
+    def __init__(self, capacity: int):
+        self.size = 0
+        self.entry_index = np.empty(capacity, dtype=np.int64)
+        self.exit_index = np.empty(capacity, dtype=np.int64)
+        self.direction = np.empty(capacity, dtype=np.int8)
+        self.entry_price = np.empty(capacity, dtype=np.float64)
+        self.exit_price = np.empty(capacity, dtype=np.float64)
+        self.quantity = np.empty(capacity, dtype=np.float64)
+        self.commission = np.empty(capacity, dtype=np.float64)
+        self.exit_reason = np.empty(capacity, dtype=np.int8)
+
+    def append(
+        self,
+        position: Dict[str, Any],
+        exit_index: int,
+        exit_price: float,
+        commission: float,
+        exit_reason: str,
+    ) -> None:
+        """Record a closed position"""
+        n = self.size
+        self.entry_index[n] = position["entry_index"]
+        self.exit_index[n] = exit_index
+        self.direction[n] = 1 if position["direction"] == "long" else -1
+        self.entry_price[n] = position["entry_price"]
+        self.exit_price[n] = exit_price
+        self.quantity[n] = position["quantity"]
+        self.commission[n] = position["entry_commission"] + commission
+        self.exit_reason[n] = self.EXIT_REASONS.index(exit_reason)
+        self.size = n + 1
+
+    def to_columns(self, index: pd.DatetimeIndex, symbol: str) -> Dict[str, Any]:
+        """Trim to the recorded trades and derive PnL columns vectorized"""
+        n = self.size
+        direction = self.direction[:n]
+        entry_price = self.entry_price[:n]
+        exit_price = self.exit_price[:n]
+        quantity = self.quantity[:n]
+        commission = self.commission[:n]
+
+        pnl = direction * quantity * (exit_price - entry_price) - commission
+        return_pct = pnl / (quantity * entry_price) * 100
+
+        return {
+            "entry_time": index[self.entry_index[:n]],
+            "exit_time": index[self.exit_index[:n]],
+            "symbol": np.full(n, symbol, dtype=object),
+            "direction": np.where(direction > 0, "long", "short").astype(object),
+            "entry_price": entry_price,
+            "exit_price": exit_price,
+            "quantity": quantity,
+            "commission": commission,
+            "exit_reason": np.array(self.EXIT_REASONS, dtype=object)[
+                self.exit_reason[:n]
+            ],
+            "pnl": pnl,
+            "return_pct": return_pct,
+        }
+
+
 class Backtester(LoggerMixin):
     """Main backtesting engine"""
 
@@ -29,12 +162,89 @@ class Backtester(LoggerMixin):
         "AI_ENHANCED": "app.services.strategies.ai_enhanced_strategy.AIEnhancedStrategy",
     }
 
+    # LRU cache sizes for historical data and indicator columns
+    DATA_CACHE_SIZE = 16
+    INDICATOR_CACHE_SIZE = 64
+
+    # Shared pool for the CPU-bound part of backtests, kept off the event loop
+    _executor = ThreadPoolExecutor(
+        max_workers=os.cpu_count() or 1, thread_name_prefix="backtest"
+    )
+
     def __init__(self):
+        self._resolve_strategies()
         self.active_backtests: Dict[str, BacktestResult] = {}
+        self._data_cache: "OrderedDict[Hashable, pd.DataFrame]" = OrderedDict()
+        self._indicator_cache: "OrderedDict[Hashable, pd.DataFrame]" = OrderedDict()
+        self._cache_lock = threading.Lock()
 
     @log_execution_time()
     async def run_backtest(self, request: BacktestRequest) -> BacktestResult:
         """Execute a backtest based on the request"""
+        result = self._create_result(request)
+
+        try:
+            # Load historical data
+            data_key = (request.symbol, request.start_date, request.end_date)
+            data = await self._get_historical_data(*data_key)
+
+            # Run the CPU-bound backtest in a worker thread
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(
+                self._executor, self._run_backtest_sync, request, result, data, data_key
+            )
+
+        except Exception as e:
+            self._mark_failed(result, e)
+
+        return result
+
+    @log_execution_time()
+    async def run_sweep(
+        self, request: BacktestRequest, param_grid: List[Dict[str, Any]]
+    ) -> List[BacktestResult]:
+        """
+        Run one backtest per parameter combination over the same data
+
+        Each entry of param_grid is merged over request.strategy_params. The
+        historical data is loaded once and the combinations run concurrently
+        on the backtest thread pool.
+        """
+        requests = [
+            request.model_copy(
+                update={"strategy_params": {**request.strategy_params, **params}}
+            )
+            for params in param_grid
+        ]
+        results = [self._create_result(r) for r in requests]
+
+        try:
+            data_key = (request.symbol, request.start_date, request.end_date)
+            data = await self._get_historical_data(*data_key)
+        except Exception as e:
+            for result in results:
+                self._mark_failed(result, e)
+            return results
+
+        loop = asyncio.get_running_loop()
+        outcomes = await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    self._executor, self._run_backtest_sync, r, result, data, data_key
+                )
+                for r, result in zip(requests, results)
+            ),
+            return_exceptions=True,
+        )
+
+        for result, outcome in zip(results, outcomes):
+            if isinstance(outcome, Exception):
+                self._mark_failed(result, outcome)
+
+        return results
+
+    def _create_result(self, request: BacktestRequest) -> BacktestResult:
+        """Create and register the initial result for a backtest"""
         backtest_id = str(uuid.uuid4())
 
         # Create initial result
@@ -52,84 +262,88 @@ class Backtester(LoggerMixin):
         )
 
         self.active_backtests[backtest_id] = result
+        return result
 
-        try:
-            # Load historical data
-            data = await self._load_historical_data(
-                request.symbol, request.start_date, request.end_date
-            )
+    def _mark_failed(self, result: BacktestResult, error: Exception) -> None:
+        """Record a backtest failure on its result"""
+        self.log_error(f"Backtest failed: {str(error)}")
+        result.status = BacktestStatus.FAILED
+        result.error_message = str(error)
+        result.completed_at = datetime.utcnow()
 
-            # Initialize strategy
-            strategy = self._create_strategy(request)
-
-            # Run backtest
-            backtest_results = self._execute_backtest(
-                strategy=strategy,
-                data=data,
-                initial_capital=request.initial_capital,
-                commission=request.commission,
-                position_size_pct=request.position_size_pct,
-                stop_loss_pct=request.stop_loss_pct,
-            )
+    def _run_backtest_sync(
+        self,
+        request: BacktestRequest,
+        result: BacktestResult,
+        data: pd.DataFrame,
+        data_key: Hashable,
+    ) -> None:
+        """Run the strategy over loaded data and fill in the result"""
+        # Initialize strategy and calculate its indicators
+        strategy = self._create_strategy(request)
+        data = self._get_indicators(strategy, data, data_key)
+
+        # Run backtest
+        backtest_results = self._execute_backtest(
+            strategy=strategy,
+            data=data,
+            initial_capital=request.initial_capital,
+            commission=request.commission,
+            position_size_pct=request.position_size_pct,
+            stop_loss_pct=request.stop_loss_pct,
+        )
 
-            # Calculate metrics
-            metrics = self._calculate_metrics(
-                trades=backtest_results["trades"],
-                equity_curve=backtest_results["equity_curve"],
-                initial_capital=request.initial_capital,
-            )
+        # Calculate metrics
+        metrics = self._calculate_metrics(
+            trades=backtest_results["trades"],
+            timestamps=backtest_results["timestamps"],
+            equity=backtest_results["equity"],
+            initial_capital=request.initial_capital,
+        )
 
-            # Update result
-            result.status = BacktestStatus.COMPLETED
-            result.final_capital = backtest_results["final_capital"]
-            result.metrics = metrics
-            result.trades = [
-                self._convert_trade_to_record(t) for t in backtest_results["trades"]
-            ]
-            result.equity_curve = backtest_results["equity_curve"]
-            result.drawdown_curve = backtest_results["drawdown_curve"]
-            result.completed_at = datetime.utcnow()
-
-            # Log completion
-            trading_logger.log_backtest_result(
-                strategy=request.strategy, metrics=metrics.dict()
-            )
+        # Update result
+        result.status = BacktestStatus.COMPLETED
+        result.final_capital = backtest_results["final_capital"]
+        result.metrics = metrics
+        result.trades = [
+            self._convert_trade_to_record(t)
+            for t in self._trade_rows(backtest_results["trades"])
+        ]
+        result.equity_curve = self._to_records(
+            backtest_results["timestamps"], backtest_results["equity"], "equity"
+        )
+        result.drawdown_curve = self._to_records(
+            backtest_results["timestamps"], backtest_results["drawdown"], "drawdown"
+        )
+        result.completed_at = datetime.utcnow()
 
-        except Exception as e:
-            self.log_error(f"Backtest failed: {str(e)}")
-            result.status = BacktestStatus.FAILED
-            result.error_message = str(e)
-            result.completed_at = datetime.utcnow()
+        # Log completion
+        trading_logger.log_backtest_result(
+            strategy=request.strategy, metrics=metrics.dict()
+        )
 
-        return result
+    @classmethod
+    def _resolve_strategies(cls) -> None:
+        """Replace registry entries given as import paths with their classes"""
+        for name, entry in cls.STRATEGIES.items():
+            if isinstance(entry, str):
+                module_path, class_name = entry.rsplit(".", 1)
+                module = importlib.import_module(module_path)
+                cls.STRATEGIES[name] = getattr(module, class_name)
 
     def _create_strategy(self, request: BacktestRequest) -> BaseStrategy:
         """Create strategy instance from request"""
-        strategy_entry = self.STRATEGIES.get(request.strategy.upper())
+        strategy_class = self.STRATEGIES.get(request.strategy.upper())
 
-        if not strategy_entry:
+        if not strategy_class:
             raise BacktestError(f"Unknown strategy: {request.strategy}")
 
-        # Handle string imports for AI strategies
-        if isinstance(strategy_entry, str):
-            module_path, class_name = strategy_entry.rsplit(".", 1)
-            module = __import__(module_path, fromlist=[class_name])
-            strategy_class = getattr(module, class_name)
-        else:
-            strategy_class = strategy_entry
-
         # Create parameters based on strategy type
         if request.strategy.upper() == "EMA_CROSSOVER":
-            params = EMACrossoverParameters(
-                symbol=request.symbol,
-                timeframe="1h",  # TODO: Make configurable
-                lookback_period=100,
-                **request.strategy_params,
-            )
-            return EMACrossoverStrategy(params)
+            params = _ema_crossover_parameters(request.symbol, request.strategy_params)
+            return strategy_class(params)
         elif request.strategy.upper() == "AI_ENHANCED":
             from app.services.strategies.ai_enhanced_strategy import (
-                AIEnhancedStrategy,
                 AIEnhancedStrategyParameters,
             )
 
@@ -149,10 +363,68 @@ class Backtester(LoggerMixin):
                 ),
                 ai_weight=request.strategy_params.get("ai_weight", 0.5),
             )
-            return AIEnhancedStrategy(params)
+            return strategy_class(params)
 
         raise BacktestError(f"Strategy {request.strategy} not properly configured")
 
+    async def _get_historical_data(
+        self, symbol: str, start_date: datetime, end_date: datetime
+    ) -> pd.DataFrame:
+        """Load historical data, reusing cached frames for repeated windows"""
+        key = (symbol, start_date, end_date)
+        data = self._cache_get(self._data_cache, key)
+        if data is None:
+            data = await self._load_historical_data(symbol, start_date, end_date)
+            self._cache_put(self._data_cache, key, data, self.DATA_CACHE_SIZE)
+        return data
+
+    def _get_indicators(
+        self, strategy: BaseStrategy, data: pd.DataFrame, data_key: Hashable
+    ) -> pd.DataFrame:
+        """
+        Calculate strategy indicators, reusing cached results
+
+        Only the indicator columns are cached; they are keyed on the strategy
+        class, its parameters and the data window, so a parameter change is a
+        cache miss rather than a stale hit.
+        """
+        key = (strategy.name, repr(strategy.parameters), data_key)
+        indicators = self._cache_get(self._indicator_cache, key)
+        if indicators is None:
+            full = strategy.calculate_indicators(data)
+            indicators = full.drop(columns=data.columns)
+            self._cache_put(
+                self._indicator_cache, key, indicators, self.INDICATOR_CACHE_SIZE
+            )
+            return full
+        return pd.concat([data, indicators], axis=1)
+
+    def _cache_get(
+        self, cache: OrderedDict, key: Hashable
+    ) -> Optional[pd.DataFrame]:
+        """Look up a cache entry and mark it as most recently used"""
+        with self._cache_lock:
+            value = cache.get(key)
+            if value is not None:
+                cache.move_to_end(key)
+            return value
+
+    def _cache_put(
+        self, cache: OrderedDict, key: Hashable, value: pd.DataFrame, maxsize: int
+    ) -> None:
+        """Insert a cache entry, evicting the least recently used overflow"""
+        with self._cache_lock:
+            cache[key] = value
+            cache.move_to_end(key)
+            while len(cache) > maxsize:
+                cache.popitem(last=False)
+
+    def clear_cache(self) -> None:
+        """Drop all cached historical data and indicators"""
+        with self._cache_lock:
+            self._data_cache.clear()
+            self._indicator_cache.clear()
+
     async def _load_historical_data(
         self, symbol: str, start_date: datetime, end_date: datetime
     ) -> pd.DataFrame:
@@ -161,29 +433,38 @@ class Backtester(LoggerMixin):
         # For now, generate synthetic data for testing
 
         dates = pd.date_range(start=start_date, end=end_date, freq="1h")
+        n = len(dates)
 
         # Generate synthetic price data
-        np.random.seed(42)  # For reproducibility
-        returns = np.random.normal(0.0001, 0.02, len(dates))
+        rng = np.random.default_rng(42)  # For reproducibility
+        returns = rng.normal(0.0001, 0.02, n)
         prices = 100 * np.exp(np.cumsum(returns))
 
-        data = pd.DataFrame(
+        # One draw for all OHLV noise; float32 is plenty for cosmetic jitter
+        noise = rng.random((n, 4), dtype=np.float32)
+        open_ = prices * (1 + (noise[:, 0] * 0.002 - 0.001))
+        high = prices * (1 + noise[:, 1] * 0.01)
+        low = prices * (1 - noise[:, 2] * 0.01)
+        volume = 1000 + noise[:, 3] * 9000.0
+
+        # Ensure high is highest and low is lowest
+        np.maximum(high, open_, out=high)
+        np.maximum(high, prices, out=high)
+        np.minimum(low, open_, out=low)
+        np.minimum(low, prices, out=low)
+
+        # Store OHLCV as float32 to halve the size of cached frames
+        return pd.DataFrame(
             {
-                "open": prices * (1 + np.random.uniform(-0.001, 0.001, len(dates))),
-                "high": prices * (1 + np.random.uniform(0, 0.01, len(dates))),
-                "low": prices * (1 - np.random.uniform(0, 0.01, len(dates))),
-                "close": prices,
-                "volume": np.random.uniform(1000, 10000, len(dates)),
+                "open": open_.astype(np.float32),
+                "high": high.astype(np.float32),
+                "low": low.astype(np.float32),
+                "close": prices.astype(np.float32),
+                "volume": volume,
             },
             index=dates,
         )
 
-        # Ensure high is highest and low is lowest
-        data["high"] = data[["open", "high", "close"]].max(axis=1)
-        data["low"] = data[["open", "low", "close"]].min(axis=1)
-
-        return data
-
     def _execute_backtest(
         self,
         strategy: BaseStrategy,
@@ -193,23 +474,28 @@ class Backtester(LoggerMixin):
         position_size_pct: float,
         stop_loss_pct: Optional[float],
     ) -> Dict[str, Any]:
-        """Execute the backtest logic"""
+        """Execute the backtest logic on data with indicators already calculated"""
         # Initialize tracking variables
         capital = initial_capital
         position = None
-        trades = []
-        equity_curve = []
-
-        # Calculate indicators once
-        data = strategy.calculate_indicators(data)
 
         # Get required lookback
         lookback = strategy.get_required_lookback()
 
+        # Equity and trades are tracked in preallocated arrays rather than
+        # per-bar dicts; at most one trade can close per bar
+        timestamps = data.index[lookback:]
+        equity = np.empty(len(timestamps), dtype=np.float64)
+        trades = _TradeBuffer(len(timestamps) + 1)
+
+        # Pull columns out once; per-bar pandas indexing is far slower.
+        # Prices may be stored as float32, but accounting stays in float64.
+        index = data.index
+        close = data["close"].to_numpy(dtype=np.float64)
+
         # Iterate through data
         for i in range(lookback, len(data)):
-            current_time = data.index[i]
-            current_price = data.iloc[i]["close"]
+            current_price = close[i]
 
             # Track equity
             current_equity = capital
@@ -219,7 +505,7 @@ class Backtester(LoggerMixin):
                 )
                 current_equity += unrealized_pnl
 
-            equity_curve.append({"timestamp": current_time, "equity": current_equity})
+            equity[i - lookback] = current_equity
 
             # Check stop loss if in position
             if position and stop_loss_pct:
@@ -232,25 +518,14 @@ class Backtester(LoggerMixin):
                         capital += exit_value - commission_cost
 
                         trades.append(
-                            {
-                                "entry_time": position["entry_time"],
-                                "exit_time": current_time,
-                                "symbol": strategy.parameters.symbol,
-                                "direction": position["direction"],
-                                "entry_price": position["entry_price"],
-                                "exit_price": current_price,
-                                "quantity": position["quantity"],
-                                "commission": position["entry_commission"]
-                                + commission_cost,
-                                "exit_reason": "stop_loss",
-                            }
+                            position, i, current_price, commission_cost, "stop_loss"
                         )
 
                         position = None
                         continue
 
             # Generate signal
-            signal = strategy.generate_signals(data.iloc[: i + 1])
+            signal = strategy.generate_signal_at(data, i)
 
             if signal:
                 if signal.direction == SignalDirection.LONG and not position:
@@ -262,7 +537,7 @@ class Backtester(LoggerMixin):
                     if commission_cost < capital:
                         capital -= position_value + commission_cost
                         position = {
-                            "entry_time": current_time,
+                            "entry_index": i,
                             "entry_price": current_price,
                             "quantity": quantity,
                             "direction": "long",
@@ -276,130 +551,80 @@ class Backtester(LoggerMixin):
                     capital += exit_value - commission_cost
 
                     trades.append(
-                        {
-                            "entry_time": position["entry_time"],
-                            "exit_time": current_time,
-                            "symbol": strategy.parameters.symbol,
-                            "direction": position["direction"],
-                            "entry_price": position["entry_price"],
-                            "exit_price": current_price,
-                            "quantity": position["quantity"],
-                            "commission": position["entry_commission"]
-                            + commission_cost,
-                            "exit_reason": "signal",
-                        }
+                        position, i, current_price, commission_cost, "signal"
                     )
 
                     position = None
 
         # Close any remaining position
         if position:
-            final_price = data.iloc[-1]["close"]
+            final_price = close[-1]
             exit_value = position["quantity"] * final_price
             commission_cost = exit_value * commission
             capital += exit_value - commission_cost
 
             trades.append(
-                {
-                    "entry_time": position["entry_time"],
-                    "exit_time": data.index[-1],
-                    "symbol": strategy.parameters.symbol,
-                    "direction": position["direction"],
-                    "entry_price": position["entry_price"],
-                    "exit_price": final_price,
-                    "quantity": position["quantity"],
-                    "commission": position["entry_commission"] + commission_cost,
-                    "exit_reason": "end_of_data",
-                }
+                position, len(data) - 1, final_price, commission_cost, "end_of_data"
             )
 
         # Calculate drawdown curve
-        equity_df = pd.DataFrame(equity_curve)
-        equity_df["peak"] = equity_df["equity"].cummax()
-        equity_df["drawdown"] = (equity_df["equity"] - equity_df["peak"]) / equity_df[
-            "peak"
-        ]
-
-        drawdown_curve = equity_df[["timestamp", "drawdown"]].to_dict("records")
-
-        # Add PnL to trades
-        for trade in trades:
-            if trade["direction"] == "long":
-                trade["pnl"] = (
-                    trade["quantity"] * (trade["exit_price"] - trade["entry_price"])
-                    - trade["commission"]
-                )
-            else:
-                trade["pnl"] = (
-                    trade["quantity"] * (trade["entry_price"] - trade["exit_price"])
-                    - trade["commission"]
-                )
-
-            trade["return_pct"] = (
-                trade["pnl"] / (trade["quantity"] * trade["entry_price"]) * 100
-            )
+        _, drawdown = compute_drawdown(equity)
 
         return {
             "final_capital": capital,
-            "trades": trades,
-            "equity_curve": equity_curve,
-            "drawdown_curve": drawdown_curve,
+            "trades": trades.to_columns(index, strategy.parameters.symbol),
+            "timestamps": timestamps,
+            "equity": equity,
+            "drawdown": drawdown,
         }
 
     def _calculate_metrics(
         self,
-        trades: List[Dict[str, Any]],
-        equity_curve: List[Dict[str, Any]],
+        trades: Dict[str, Any],
+        timestamps: pd.DatetimeIndex,
+        equity: np.ndarray,
         initial_capital: float,
     ) -> BacktestMetrics:
         """Calculate performance metrics from trades"""
-        if not trades:
+        total_trades = len(trades["pnl"])
+        if not total_trades:
             return self._empty_metrics()
 
-        # Convert to DataFrame for easier calculation
-        trades_df = pd.DataFrame(trades)
-        equity_df = pd.DataFrame(equity_curve)
+        # Partition PnL into wins and losses once
+        pnl = trades["pnl"]
+        winning_pnls = pnl[pnl > 0]
+        losing_pnls = pnl[pnl < 0]
 
         # Basic metrics
-        total_trades = len(trades)
-        winning_trades = len(trades_df[trades_df["pnl"] > 0])
-        losing_trades = len(trades_df[trades_df["pnl"] < 0])
+        winning_trades = len(winning_pnls)
+        losing_trades = len(losing_pnls)
         win_rate = winning_trades / total_trades if total_trades > 0 else 0
 
         # Returns
-        total_return = (
-            equity_df["equity"].iloc[-1] - initial_capital
-        ) / initial_capital
-        days = (equity_df["timestamp"].iloc[-1] - equity_df["timestamp"].iloc[0]).days
+        total_return = (equity[-1] - initial_capital) / initial_capital
+        period = timestamps[-1] - timestamps[0]
+        days = period.days
         annualized_return = (
             (1 + total_return) ** (365 / max(days, 1)) - 1 if days > 0 else 0
         )
-        average_trade_return = trades_df["return_pct"].mean() / 100
+        average_trade_return = trades["return_pct"].mean() / 100
 
         # Risk metrics
-        equity_df["returns"] = equity_df["equity"].pct_change()
+        mean_return, return_std, downside_std = compute_return_stats(equity)
 
         # Maximum drawdown
-        equity_df["peak"] = equity_df["equity"].cummax()
-        equity_df["drawdown"] = (equity_df["equity"] - equity_df["peak"]) / equity_df[
-            "peak"
-        ]
-        max_drawdown = equity_df["drawdown"].min()
+        _, drawdown = compute_drawdown(equity)
+        max_drawdown = float(drawdown.min())
 
         # Sharpe ratio (assuming 0% risk-free rate)
-        if equity_df["returns"].std() > 0:
-            sharpe_ratio = (
-                np.sqrt(252) * equity_df["returns"].mean() / equity_df["returns"].std()
-            )
+        if return_std > 0:
+            sharpe_ratio = np.sqrt(252) * mean_return / return_std
         else:
             sharpe_ratio = 0
 
         # Sortino ratio
-        negative_returns = equity_df["returns"][equity_df["returns"] < 0]
-        if len(negative_returns) > 0 and negative_returns.std() > 0:
-            sortino_ratio = (
-                np.sqrt(252) * equity_df["returns"].mean() / negative_returns.std()
-            )
+        if downside_std > 0:
+            sortino_ratio = np.sqrt(252) * mean_return / downside_std
         else:
             sortino_ratio = 0
 
@@ -407,9 +632,6 @@ class Backtester(LoggerMixin):
         calmar_ratio = annualized_return / abs(max_drawdown) if max_drawdown != 0 else 0
 
         # Win/loss metrics
-        winning_pnls = trades_df[trades_df["pnl"] > 0]["pnl"]
-        losing_pnls = trades_df[trades_df["pnl"] < 0]["pnl"]
-
         average_win = winning_pnls.mean() if len(winning_pnls) > 0 else 0
         average_loss = losing_pnls.mean() if len(losing_pnls) > 0 else 0
         largest_win = winning_pnls.max() if len(winning_pnls) > 0 else 0
@@ -421,18 +643,17 @@ class Backtester(LoggerMixin):
         profit_factor = gross_profit / gross_loss if gross_loss > 0 else 0
 
         # Time metrics
-        trades_df["duration"] = pd.to_datetime(trades_df["exit_time"]) - pd.to_datetime(
-            trades_df["entry_time"]
+        # Trade times are already datetime64, so subtract them directly
+        durations = (
+            (trades["exit_time"].to_numpy() - trades["entry_time"].to_numpy())
+            .astype("timedelta64[s]")
+            .astype(np.int64)
         )
-        average_trade_duration = (
-            trades_df["duration"].mean().total_seconds() / 3600
-        )  # in hours
+        average_trade_duration = float(durations.mean()) / 3600  # in hours
 
         # Market exposure
-        total_time = (
-            equity_df["timestamp"].iloc[-1] - equity_df["timestamp"].iloc[0]
-        ).total_seconds()
-        time_in_market = trades_df["duration"].sum().total_seconds()
+        total_time = period.total_seconds()
+        time_in_market = float(durations.sum())
         total_market_exposure = time_in_market / total_time if total_time > 0 else 0
 
         return BacktestMetrics(
@@ -456,9 +677,30 @@ class Backtester(LoggerMixin):
             total_market_exposure=total_market_exposure,
         )
 
+    @staticmethod
+    def _to_records(
+        timestamps: pd.DatetimeIndex, values: np.ndarray, key: str
+    ) -> List[Dict[str, Any]]:
+        """Convert a timestamp/value array pair into API chart records"""
+        return [
+            {"timestamp": ts, key: value}
+            for ts, value in zip(timestamps, values.tolist())
+        ]
+
+    @staticmethod
+    def _trade_rows(trades: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Materialize per-trade dicts from the trade columns"""
+        keys = list(trades)
+        columns = [trades[key].tolist() for key in keys]
+        return [dict(zip(keys, row)) for row in zip(*columns)]
+
     def _convert_trade_to_record(self, trade: Dict[str, Any]) -> TradeRecord:
-        """Convert internal trade dict to TradeRecord model"""
-        return TradeRecord(
+        """Convert internal trade dict to TradeRecord model
+
+        The values come straight from the backtest engine and are already
+        typed, so validation is skipped.
+        """
+        return TradeRecord.model_construct(
             entry_time=trade["entry_time"],
             exit_time=trade["exit_time"],
             symbol=trade["symbol"],
@@ -513,14 +755,12 @@ class Backtester(LoggerMixin):
         # This is a wrapper that adds progress callback support
         if progress_callback:
             progress_callback(0, "Loading historical data...")
-        
-        # Run the synchronous backtest
-        # In a real implementation, this would be properly async
-        result = self.run_backtest(request)
-        
+
+        result = await self.run_backtest(request)
+
         if progress_callback:
             progress_callback(100, "Backtest completed")
-        
+
         return result
 
 
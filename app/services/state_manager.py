@@ -3,14 +3,20 @@
 OPTIMIZATION: Consolidates state management for strategies, backtests, and positions
 into a single service. Reduces code duplication and improves consistency.
 """
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime
 from dataclasses import dataclass, field
 from enum import Enum
+from app.core.compat import DATACLASS_SLOTS
 from app.core.logger import get_logger
 from app.models.base import BaseTradingSignal
+from collections import defaultdict
+from contextlib import ExitStack
 import asyncio
+import itertools
 import json
+import threading
+import time
 
 
 logger = get_logger(__name__)
@@ -25,7 +31,7 @@ class StateType(str, Enum):
     SIGNAL = "signal"
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class StateEntry:
     """Generic state entry that can represent any stateful object."""
 
@@ -35,12 +41,28 @@ class StateEntry:
     created_at: datetime = field(default_factory=datetime.utcnow)
     updated_at: datetime = field(default_factory=datetime.utcnow)
     metadata: Dict[str, Any] = field(default_factory=dict)
+    _created_iso: Optional[str] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def update(self, data: Dict[str, Any]) -> None:
         """Update state data and timestamp."""
         self.data.update(data)
         self.updated_at = datetime.utcnow()
 
+    def export(self) -> Dict[str, Any]:
+        """Export entry as a serializable dict."""
+        # created_at never changes, so format it only once
+        if self._created_iso is None:
+            self._created_iso = self.created_at.isoformat()
+
+        return {
+            "data": self.data,
+            "created_at": self._created_iso,
+            "updated_at": self.updated_at.isoformat(),
+            "metadata": self.metadata,
+        }
+
 
 class StateManager:
     """
@@ -49,16 +71,38 @@ class StateManager:
     OPTIMIZATION: Single service replaces multiple in-memory dictionaries
     scattered across different services. Provides consistent interface
     for all state management needs.
+
+    OPTIMIZATION: Writes lock a stripe selected by (type, id) instead of one
+    global lock, so writes to unrelated entries never contend. Reads take no
+    lock since single dict operations are atomic under the GIL.
+
+    OPTIMIZATION: Critical sections never await, so mutations live in a
+    synchronous core guarded by threading locks. The async methods call it
+    and then notify listeners; callers that don't need notifications (or
+    run outside the event loop) can use the *_sync methods directly.
     """
 
+    LOCK_STRIPES = 16  # must be a power of two
+
     def __init__(self):
         self._state: Dict[StateType, Dict[str, StateEntry]] = {
             state_type: {} for state_type in StateType
         }
-        self._lock = asyncio.Lock()
+        self._locks: Dict[StateType, List[threading.Lock]] = {
+            state_type: [threading.Lock() for _ in range(self.LOCK_STRIPES)]
+            for state_type in StateType
+        }
         self._listeners: Dict[StateType, List[callable]] = {
             state_type: [] for state_type in StateType
         }
+        self._id_counter = itertools.count()
+        # Secondary index of open position ids per symbol; dicts act as
+        # insertion-ordered sets so results keep creation order. Positions on
+        # different stripes share it, so it has its own lock.
+        self._open_positions: Dict[Optional[str], Dict[str, None]] = defaultdict(
+            dict
+        )
+        self._index_lock = threading.Lock()
 
     async def create(
         self,
@@ -68,73 +112,183 @@ class StateManager:
         metadata: Optional[Dict[str, Any]] = None,
     ) -> StateEntry:
         """Create a new state entry."""
-        async with self._lock:
-            if id in self._state[state_type]:
-                raise ValueError(f"{state_type} with id {id} already exists")
-
-            entry = StateEntry(
-                id=id, type=state_type, data=data, metadata=metadata or {}
-            )
-
-            self._state[state_type][id] = entry
-            await self._notify_listeners(state_type, "create", entry)
-
-            logger.info(f"Created {state_type} state: {id}")
-            return entry
+        entry = self.create_sync(state_type, id, data, metadata)
+        await self._notify_listeners(state_type, "create", entry)
+        return entry
 
     async def update(
         self, state_type: StateType, id: str, data: Dict[str, Any]
     ) -> Optional[StateEntry]:
         """Update an existing state entry."""
-        async with self._lock:
-            entry = self._state[state_type].get(id)
-            if not entry:
-                logger.warning(f"{state_type} with id {id} not found")
-                return None
-
-            entry.update(data)
+        entry = self.update_sync(state_type, id, data)
+        if entry:
             await self._notify_listeners(state_type, "update", entry)
+        return entry
 
-            logger.debug(f"Updated {state_type} state: {id}")
-            return entry
+    async def upsert(
+        self, state_type: StateType, id: str, data: Dict[str, Any]
+    ) -> StateEntry:
+        """Update a state entry, creating it if it doesn't exist."""
+        entry, created = self._upsert(state_type, id, data)
+        await self._notify_listeners(
+            state_type, "create" if created else "update", entry
+        )
+        return entry
 
     async def get(self, state_type: StateType, id: str) -> Optional[StateEntry]:
         """Get a state entry by ID."""
-        async with self._lock:
-            return self._state[state_type].get(id)
+        return self._state[state_type].get(id)
 
     async def get_all(
         self, state_type: StateType, filter_func: Optional[callable] = None
     ) -> List[StateEntry]:
         """Get all state entries of a type, optionally filtered."""
-        async with self._lock:
-            entries = list(self._state[state_type].values())
+        entries = list(self._state[state_type].values())
 
-            if filter_func:
-                entries = [e for e in entries if filter_func(e)]
+        if filter_func:
+            entries = [e for e in entries if filter_func(e)]
 
-            return entries
+        return entries
 
     async def delete(self, state_type: StateType, id: str) -> bool:
         """Delete a state entry."""
-        async with self._lock:
-            if id not in self._state[state_type]:
-                return False
-
-            entry = self._state[state_type].pop(id)
-            await self._notify_listeners(state_type, "delete", entry)
+        entry = self._pop(state_type, id)
+        if not entry:
+            return False
 
-            logger.info(f"Deleted {state_type} state: {id}")
-            return True
+        await self._notify_listeners(state_type, "delete", entry)
+        return True
 
     async def clear(self, state_type: StateType) -> int:
         """Clear all entries of a specific type."""
-        async with self._lock:
+        return self.clear_sync(state_type)
+
+    # Synchronous core; these don't notify listeners
+
+    def create_sync(
+        self,
+        state_type: StateType,
+        id: str,
+        data: Dict[str, Any],
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> StateEntry:
+        """Create a new state entry without notifying listeners."""
+        with self._stripe(state_type, id):
+            if id in self._state[state_type]:
+                raise ValueError(f"{state_type} with id {id} already exists")
+
+            entry = StateEntry(
+                id=id, type=state_type, data=data, metadata=metadata or {}
+            )
+
+            self._state[state_type][id] = entry
+            if state_type == StateType.POSITION:
+                self._index_position(entry)
+
+        logger.info("State created", state_type=state_type, id=id)
+        return entry
+
+    def update_sync(
+        self, state_type: StateType, id: str, data: Dict[str, Any]
+    ) -> Optional[StateEntry]:
+        """Update an existing state entry without notifying listeners."""
+        with self._stripe(state_type, id):
+            entry = self._state[state_type].get(id)
+            if not entry:
+                logger.warning("State not found", state_type=state_type, id=id)
+                return None
+
+            if state_type == StateType.POSITION:
+                self._unindex_position(entry)
+                entry.update(data)
+                self._index_position(entry)
+            else:
+                entry.update(data)
+
+        logger.debug("State updated", state_type=state_type, id=id)
+        return entry
+
+    def upsert_sync(
+        self, state_type: StateType, id: str, data: Dict[str, Any]
+    ) -> StateEntry:
+        """Update or create a state entry without notifying listeners."""
+        return self._upsert(state_type, id, data)[0]
+
+    def delete_sync(self, state_type: StateType, id: str) -> bool:
+        """Delete a state entry without notifying listeners."""
+        return self._pop(state_type, id) is not None
+
+    def clear_sync(self, state_type: StateType) -> int:
+        """Clear all entries of a specific type."""
+        with ExitStack() as stack:
+            # Take every stripe in a fixed order so concurrent clears can't deadlock
+            for lock in self._locks[state_type]:
+                stack.enter_context(lock)
+
             count = len(self._state[state_type])
             self._state[state_type].clear()
+            if state_type == StateType.POSITION:
+                with self._index_lock:
+                    self._open_positions.clear()
 
-            logger.info(f"Cleared {count} {state_type} entries")
-            return count
+        logger.info("State cleared", state_type=state_type, count=count)
+        return count
+
+    def _upsert(
+        self, state_type: StateType, id: str, data: Dict[str, Any]
+    ) -> Tuple[StateEntry, bool]:
+        """Upsert an entry, returning it and whether it was created."""
+        with self._stripe(state_type, id):
+            entry = self._state[state_type].get(id)
+            is_position = state_type == StateType.POSITION
+
+            if entry:
+                created = False
+                if is_position:
+                    self._unindex_position(entry)
+                entry.update(data)
+            else:
+                created = True
+                entry = StateEntry(id=id, type=state_type, data=data)
+                self._state[state_type][id] = entry
+
+            if is_position:
+                self._index_position(entry)
+
+        logger.debug("State upserted", state_type=state_type, id=id)
+        return entry, created
+
+    def _pop(self, state_type: StateType, id: str) -> Optional[StateEntry]:
+        """Remove and return an entry, or None if it doesn't exist."""
+        with self._stripe(state_type, id):
+            entry = self._state[state_type].pop(id, None)
+            if entry is None:
+                return None
+            if state_type == StateType.POSITION:
+                self._unindex_position(entry)
+
+        logger.info("State deleted", state_type=state_type, id=id)
+        return entry
+
+    def _index_position(self, entry: StateEntry) -> None:
+        """Add a position to the open index if it is open."""
+        if entry.data.get("status") == "open":
+            with self._index_lock:
+                self._open_positions[entry.data.get("symbol")][entry.id] = None
+
+    def _unindex_position(self, entry: StateEntry) -> None:
+        """Remove a position from the open index."""
+        symbol = entry.data.get("symbol")
+        with self._index_lock:
+            ids = self._open_positions.get(symbol)
+            if ids is not None:
+                ids.pop(entry.id, None)
+                if not ids:
+                    del self._open_positions[symbol]
+
+    def _stripe(self, state_type: StateType, id: str) -> threading.Lock:
+        """Return the lock guarding writes to a given entry."""
+        return self._locks[state_type][hash(id) & (self.LOCK_STRIPES - 1)]
 
     def subscribe(self, state_type: StateType, callback: callable) -> callable:
         """Subscribe to state changes. Returns unsubscribe function."""
@@ -149,12 +303,23 @@ class StateManager:
     async def _notify_listeners(
         self, state_type: StateType, action: str, entry: StateEntry
     ):
-        """Notify all listeners of state changes."""
-        for listener in self._listeners[state_type]:
-            try:
-                await listener(action, entry)
-            except Exception as e:
-                logger.error(f"Error notifying listener: {e}")
+        """Notify all listeners of state changes concurrently."""
+        listeners = self._listeners[state_type]
+        if not listeners:
+            return
+
+        async def call(listener):
+            # Calling inside the coroutine means a listener that raises
+            # synchronously (or isn't async) fails here, not in gather's args
+            await listener(action, entry)
+
+        results = await asyncio.gather(
+            *(call(listener) for listener in listeners),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error("Error notifying listener", error=str(result))
 
     # Convenience methods for specific state types
 
@@ -162,7 +327,8 @@ class StateManager:
         self, symbol: str, signal: BaseTradingSignal, **kwargs
     ) -> StateEntry:
         """Create a position from a trading signal."""
-        position_id = f"{symbol}_{datetime.utcnow().timestamp()}"
+        # Counter suffix keeps ids unique even within one clock tick
+        position_id = f"{symbol}_{time.time_ns()}_{next(self._id_counter)}"
 
         position_data = {
             "symbol": symbol,
@@ -181,53 +347,41 @@ class StateManager:
         self, symbol: Optional[str] = None
     ) -> List[StateEntry]:
         """Get all open positions, optionally filtered by symbol."""
-
-        def filter_open(entry: StateEntry) -> bool:
-            is_open = entry.data.get("status") == "open"
+        # Read the open index instead of scanning every position ever created
+        with self._index_lock:
             if symbol:
-                return is_open and entry.data.get("symbol") == symbol
-            return is_open
+                ids = list(self._open_positions.get(symbol, ()))
+            else:
+                ids = [id for group in self._open_positions.values() for id in group]
+
+        positions = self._state[StateType.POSITION]
+        entries = (positions.get(id) for id in ids)
+        # Re-check status in case entry data was mutated in place
+        return [e for e in entries if e and e.data.get("status") == "open"]
 
-        return await self.get_all(StateType.POSITION, filter_open)
+    async def close_position(self, position_id: str) -> Optional[StateEntry]:
+        """Mark a position as closed."""
+        return await self.update(
+            StateType.POSITION, position_id, {"status": "closed"}
+        )
 
     async def update_strategy_state(
         self, strategy_name: str, state_data: Dict[str, Any]
     ) -> StateEntry:
         """Update or create strategy state."""
-        existing = await self.get(StateType.STRATEGY, strategy_name)
-
-        if existing:
-            return await self.update(StateType.STRATEGY, strategy_name, state_data)
-        else:
-            return await self.create(StateType.STRATEGY, strategy_name, state_data)
+        return await self.upsert(StateType.STRATEGY, strategy_name, state_data)
 
     def export_state(self, state_type: Optional[StateType] = None) -> Dict[str, Any]:
         """Export state for persistence or debugging."""
-        if state_type:
-            return {
-                str(state_type): {
-                    id: {
-                        "data": entry.data,
-                        "created_at": entry.created_at.isoformat(),
-                        "updated_at": entry.updated_at.isoformat(),
-                        "metadata": entry.metadata,
-                    }
-                    for id, entry in self._state[state_type].items()
-                }
+        state_types = [state_type] if state_type else list(StateType)
+
+        # Snapshot items so concurrent writes can't change dict size mid-walk
+        return {
+            str(st): {
+                id: entry.export() for id, entry in list(self._state[st].items())
             }
-        else:
-            result = {}
-            for st in StateType:
-                result[str(st)] = {
-                    id: {
-                        "data": entry.data,
-                        "created_at": entry.created_at.isoformat(),
-                        "updated_at": entry.updated_at.isoformat(),
-                        "metadata": entry.metadata,
-                    }
-                    for id, entry in self._state[st].items()
-                }
-            return result
+            for st in state_types
+        }
 
 
 # Global singleton instance
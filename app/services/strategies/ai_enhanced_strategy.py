@@ -1,24 +1,84 @@
 from typing import Optional, Dict, Any
+import re
+import numpy as np
 import pandas as pd
 from dataclasses import dataclass
+from app.core.compat import DATACLASS_SLOTS
 from app.services.strategies.base import (
     BaseStrategy,
     StrategyParameters,
     TradingSignal,
     SignalDirection,
 )
-from app.services.strategies.ema_crossover import (
-    EMACrossoverStrategy,
-    EMACrossoverParameters,
-)
+from app.services.strategies.ema_crossover import get_ema_crossover_strategy
 from app.services.ai_service import get_ai_service, AIAnalysisError
 from app.models.tradingview import TradingViewAlert
 from app.core.logger import get_logger
 
 logger = get_logger(__name__)
 
-
-@dataclass
+# TradingView alert signal for each strategy signal direction
+_SIGNAL_DIRECTION_MAP = {
+    SignalDirection.LONG: "buy",
+    SignalDirection.SHORT: "sell",
+    SignalDirection.NEUTRAL: "close",
+}
+
+# Free-text AI recommendations that adjust stop loss / take profit
+_TIGHTEN_STOP_LOSS_RE = re.compile("tighten stop loss", re.IGNORECASE)
+_WIDEN_TAKE_PROFIT_RE = re.compile("widen take profit", re.IGNORECASE)
+
+
+def _trend_from_closes(closes: np.ndarray) -> str:
+    """Classify the trend from price vs. its 20 and 50 period SMAs."""
+    if len(closes) < 50:
+        return "insufficient_data"
+
+    # Only the last 50 closes matter, so skip full-length rolling means
+    closes = closes[-50:]
+    sma_20 = closes[-20:].mean()
+    sma_50 = closes.mean()
+    current_price = closes[-1]
+
+    if current_price > sma_20 > sma_50:
+        return "strong_uptrend"
+    elif current_price > sma_20:
+        return "uptrend"
+    elif current_price < sma_20 < sma_50:
+        return "strong_downtrend"
+    elif current_price < sma_20:
+        return "downtrend"
+    else:
+        return "sideways"
+
+
+def _latest_volatility(closes: np.ndarray, period: int = 20) -> float:
+    """Standard deviation of the last period returns (NaN if too short)."""
+    if len(closes) <= period:
+        return float("nan")
+
+    window = closes[-(period + 1) :]
+    returns = np.diff(window) / window[:-1]
+    return float(returns.std(ddof=1))
+
+
+def _extreme_levels(window: np.ndarray, largest: bool, count: int = 3) -> list:
+    """Return the most extreme values of window, most extreme first."""
+    # Skip missing bars like nlargest/nsmallest do; np.partition would sort
+    # NaN above every real value
+    window = window[~np.isnan(window)]
+    # np.partition selects the extremes in linear time; only those get sorted
+    k = min(count, len(window))
+    if k == 0:
+        return []
+    if largest:
+        levels = np.sort(np.partition(window, -k)[-k:])[::-1]
+    else:
+        levels = np.sort(np.partition(window, k - 1)[:k])
+    return [float(level) for level in levels]
+
+
+@dataclass(**DATACLASS_SLOTS)
 class AIEnhancedStrategyParameters(StrategyParameters):
     """Parameters for AI-enhanced strategy wrapper"""
 
@@ -47,16 +107,22 @@ class AIEnhancedStrategy(BaseStrategy):
 
         # Initialize base strategy
         if self.params.base_strategy == "EMA_CROSSOVER":
-            base_params = EMACrossoverParameters(
-                symbol=parameters.symbol,
-                timeframe=parameters.timeframe,
-                lookback_period=parameters.lookback_period,
+            self.base_strategy = get_ema_crossover_strategy(
+                parameters.symbol,
+                parameters.timeframe,
+                parameters.lookback_period,
                 **(parameters.base_strategy_params or {}),
             )
-            self.base_strategy = EMACrossoverStrategy(base_params)
         else:
             raise ValueError(f"Unknown base strategy: {self.params.base_strategy}")
 
+        # Base strategy parameters are fixed, so its lookback is too
+        self._lookback = self.base_strategy.get_required_lookback()
+        # Sync signals assume a fixed 0.8 AI score; weighting never changes
+        self._sync_strength_multiplier = (
+            1 - self.params.ai_weight
+        ) + self.params.ai_weight * 0.8
+
         # Initialize AI service
         try:
             self.ai_service = get_ai_service()
@@ -67,20 +133,13 @@ class AIEnhancedStrategy(BaseStrategy):
 
     def get_required_lookback(self) -> int:
         """Use base strategy's lookback requirement"""
-        return self.base_strategy.get_required_lookback()
+        return self._lookback
 
     def calculate_indicators(self, data: pd.DataFrame) -> pd.DataFrame:
-        """Calculate base strategy indicators plus AI-specific ones"""
-        # Calculate base strategy indicators
-        data = self.base_strategy.calculate_indicators(data)
-
-        # Add AI-specific indicators
-        if self.ai_enabled and self.params.use_ai_market_context:
-            # Calculate volatility for AI context
-            data["volatility"] = data["close"].pct_change().rolling(20).std()
-            data["volume_trend"] = data["volume"].rolling(20).mean()
-
-        return data
+        """Calculate base strategy indicators"""
+        # AI market context only needs the latest volatility, which
+        # _prepare_market_context computes from the tail of the data
+        return self.base_strategy.calculate_indicators(data)
 
     async def generate_signals_async(
         self, data: pd.DataFrame
@@ -119,8 +178,10 @@ class AIEnhancedStrategy(BaseStrategy):
             ai_confidence = ai_analysis.get("confidence", 0)
             if ai_confidence < self.params.ai_confidence_threshold:
                 logger.info(
-                    f"AI confidence too low: {ai_confidence}% < {self.params.ai_confidence_threshold}%",
+                    "AI confidence too low",
                     symbol=self.params.symbol,
+                    confidence=ai_confidence,
+                    threshold=self.params.ai_confidence_threshold,
                 )
                 return None
 
@@ -138,80 +199,62 @@ class AIEnhancedStrategy(BaseStrategy):
         """Synchronous wrapper for compatibility"""
         # For now, we'll use base strategy only in sync mode
         # In production, you'd want to handle async properly
-        base_signal = self.base_strategy.generate_signals(data)
+        return self._apply_sync_ai_weight(self.base_strategy.generate_signals(data))
+
+    def generate_signal_at(
+        self, data: pd.DataFrame, i: int
+    ) -> Optional[TradingSignal]:
+        """Synchronous signal for candle i, delegating to the base strategy"""
+        return self._apply_sync_ai_weight(
+            self.base_strategy.generate_signal_at(data, i)
+        )
 
+    def _apply_sync_ai_weight(
+        self, base_signal: Optional[TradingSignal]
+    ) -> Optional[TradingSignal]:
+        """Apply the fixed AI weighting used when analysis can't run"""
         if not base_signal or not self.ai_enabled:
             return base_signal
 
         # Apply basic AI confidence adjustment
         # In production, this should be async
-        base_signal.strength *= (
-            1 - self.params.ai_weight
-        ) + self.params.ai_weight * 0.8
+        if self._sync_strength_multiplier != 1.0:
+            base_signal.strength *= self._sync_strength_multiplier
 
         return base_signal
 
     def _prepare_market_context(self, data: pd.DataFrame) -> Dict[str, Any]:
         """Prepare market context for AI analysis"""
-        last_row = data.iloc[-1]
+        # Work on raw arrays; pandas tail()/iloc allocate a Series per access
+        close = data["close"].to_numpy()
+        high = data["high"].to_numpy()
+        low = data["low"].to_numpy()
+        volume = data["volume"].to_numpy()
 
         context = {
-            "current_price": float(last_row["close"]),
-            "24h_high": float(data["high"].tail(24).max()),
-            "24h_low": float(data["low"].tail(24).min()),
-            "24h_volume": float(data["volume"].tail(24).sum()),
-            "volatility": float(last_row.get("volatility", 0)),
-            "trend": self._determine_trend(data),
-            "support_levels": self._find_support_resistance(data, "support"),
-            "resistance_levels": self._find_support_resistance(data, "resistance"),
+            "current_price": float(close[-1]),
+            "24h_high": float(high[-24:].max()),
+            "24h_low": float(low[-24:].min()),
+            "24h_volume": float(volume[-24:].sum()),
+            "volatility": _latest_volatility(close)
+            if self.params.use_ai_market_context
+            else 0.0,
+            # Reuse the arrays above rather than re-extracting per helper
+            "trend": _trend_from_closes(close),
+            "support_levels": _extreme_levels(low[-50:], largest=False),
+            "resistance_levels": _extreme_levels(high[-50:], largest=True),
         }
 
         # Add base strategy indicators
         if "ema_fast" in data.columns:
-            context["ema_fast"] = float(last_row["ema_fast"])
-            context["ema_slow"] = float(last_row["ema_slow"])
+            context["ema_fast"] = float(data["ema_fast"].iat[-1])
+            context["ema_slow"] = float(data["ema_slow"].iat[-1])
 
         return context
 
-    def _determine_trend(self, data: pd.DataFrame) -> str:
-        """Determine market trend"""
-        sma_20 = data["close"].rolling(20).mean()
-        sma_50 = data["close"].rolling(50).mean()
-
-        if len(sma_20) < 50:
-            return "insufficient_data"
-
-        current_price = data["close"].iloc[-1]
-
-        if current_price > sma_20.iloc[-1] > sma_50.iloc[-1]:
-            return "strong_uptrend"
-        elif current_price > sma_20.iloc[-1]:
-            return "uptrend"
-        elif current_price < sma_20.iloc[-1] < sma_50.iloc[-1]:
-            return "strong_downtrend"
-        elif current_price < sma_20.iloc[-1]:
-            return "downtrend"
-        else:
-            return "sideways"
-
-    def _find_support_resistance(self, data: pd.DataFrame, level_type: str) -> list:
-        """Find support or resistance levels"""
-        # Simple implementation - find recent highs/lows
-        if level_type == "support":
-            levels = data["low"].tail(50).nsmallest(3).tolist()
-        else:
-            levels = data["high"].tail(50).nlargest(3).tolist()
-
-        return [float(level) for level in levels]
-
     def _convert_signal_direction(self, direction: SignalDirection) -> str:
         """Convert strategy signal direction to TradingView format"""
-        if direction == SignalDirection.LONG:
-            return "buy"
-        elif direction == SignalDirection.SHORT:
-            return "sell"
-        else:
-            return "close"
+        return _SIGNAL_DIRECTION_MAP[direction]
 
     def _enhance_signal_with_ai(
         self, base_signal: TradingSignal, ai_analysis: Dict[str, Any]
@@ -247,13 +290,13 @@ class AIEnhancedStrategy(BaseStrategy):
         # Adjust stop loss/take profit based on AI recommendations
         recommendations = ai_analysis.get("recommendations", [])
         for rec in recommendations:
-            if "tighten stop loss" in rec.lower() and base_signal.stop_loss:
+            if _TIGHTEN_STOP_LOSS_RE.search(rec) and base_signal.stop_loss:
                 # Tighten stop loss by 10%
                 if base_signal.direction == SignalDirection.LONG:
                     base_signal.stop_loss = base_signal.entry_price - (
                         (base_signal.entry_price - base_signal.stop_loss) * 0.9
                     )
-            elif "widen take profit" in rec.lower() and base_signal.take_profit:
+            elif _WIDEN_TAKE_PROFIT_RE.search(rec) and base_signal.take_profit:
                 # Widen take profit by 20%
                 if base_signal.direction == SignalDirection.LONG:
                     base_signal.take_profit = base_signal.entry_price + (
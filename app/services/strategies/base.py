@@ -1,9 +1,11 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Dict, Any, Optional, List, NamedTuple, Tuple
 from dataclasses import dataclass
 from datetime import datetime
+import numpy as np
 import pandas as pd
 from enum import Enum
+from app.core.compat import DATACLASS_SLOTS
 from app.core.logger import LoggerMixin
 from app.models.base import BaseTradingSignal
 
@@ -14,7 +16,7 @@ class SignalDirection(str, Enum):
     NEUTRAL = "neutral"
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class TradingSignal:
     """Represents a trading signal from a strategy.
 
@@ -43,7 +45,19 @@ class TradingSignal:
         }
 
 
-@dataclass
+class BacktestTrade(NamedTuple):
+    """A closed trade from BaseStrategy.backtest"""
+
+    entry_time: datetime
+    exit_time: datetime
+    entry_price: float
+    exit_price: float
+    size: float
+    pnl: float
+    ret: float  # pnl relative to entry value
+
+
+@dataclass(**DATACLASS_SLOTS)
 class StrategyParameters:
     """Base parameters that all strategies should have"""
 
@@ -59,6 +73,9 @@ class BaseStrategy(ABC, LoggerMixin):
         self.parameters = parameters
         self.name = self.__class__.__name__
         self._is_initialized = False
+        # Logger with the fixed strategy/symbol context bound once, so
+        # per-signal log calls only pass the fields that change
+        self._log = self.logger.bind(strategy=self.name, symbol=parameters.symbol)
 
     @abstractmethod
     def calculate_indicators(self, data: pd.DataFrame) -> pd.DataFrame:
@@ -86,6 +103,25 @@ class BaseStrategy(ABC, LoggerMixin):
         """
         pass
 
+    def generate_signal_at(
+        self, data: pd.DataFrame, i: int
+    ) -> Optional[TradingSignal]:
+        """
+        Generate the trading signal for candle ``i`` of a full history
+
+        Backtests call this once per candle with indicators already calculated.
+        The default re-slices the history, which makes a backtest O(N^2);
+        strategies should override it to read row ``i`` directly.
+
+        Args:
+            data: DataFrame with OHLCV data and indicators for the whole period
+            i: Positional index of the current candle
+
+        Returns:
+            TradingSignal if conditions are met, None otherwise
+        """
+        return self.generate_signals(data.iloc[: i + 1])
+
     @abstractmethod
     def get_required_lookback(self) -> int:
         """
@@ -182,19 +218,28 @@ class BaseStrategy(ABC, LoggerMixin):
         # Calculate indicators
         data = self.calculate_indicators(data)
 
-        # Initialize backtest variables
-        positions = []
-        trades = []
+        # Initialize backtest variables. Trades are kept as preallocated
+        # columns; a trade needs two candles, so len(data) is an upper bound.
+        max_trades = len(data)
+        entry_idx = np.empty(max_trades, dtype=np.int64)
+        exit_idx = np.empty(max_trades, dtype=np.int64)
+        entry_prices = np.empty(max_trades, dtype=np.float64)
+        exit_prices = np.empty(max_trades, dtype=np.float64)
+        sizes = np.empty(max_trades, dtype=np.float64)
+        n = 0
         capital = initial_capital
         position = None
 
+        # Pull columns out once so the loop does O(1) work per candle
+        index = data.index
+        close = data["close"].to_numpy(dtype=np.float64)
+
         # Generate signals for each candle
         for i in range(self.get_required_lookback(), len(data)):
-            current_data = data.iloc[: i + 1]
-            signal = self.generate_signals(current_data)
+            signal = self.generate_signal_at(data, i)
 
             if signal:
-                current_price = data.iloc[i]["close"]
+                current_price = close[i]
 
                 # Handle signal
                 if signal.direction == SignalDirection.LONG and position is None:
@@ -203,52 +248,58 @@ class BaseStrategy(ABC, LoggerMixin):
                     cost = position_size * current_price * (1 + commission)
 
                     if cost <= capital:
-                        position = {
-                            "entry_time": data.index[i],
-                            "entry_price": current_price,
-                            "size": position_size,
-                            "direction": "long",
-                            "stop_loss": signal.stop_loss,
-                            "take_profit": signal.take_profit,
-                        }
+                        position = (i, current_price, position_size)
                         capital -= cost
 
                 elif signal.direction == SignalDirection.NEUTRAL and position:
                     # Close position
-                    exit_price = current_price
-                    pnl = position["size"] * (exit_price - position["entry_price"])
-                    proceeds = position["size"] * exit_price * (1 - commission)
-                    capital += proceeds
-
-                    trades.append(
-                        {
-                            "entry_time": position["entry_time"],
-                            "exit_time": data.index[i],
-                            "entry_price": position["entry_price"],
-                            "exit_price": exit_price,
-                            "size": position["size"],
-                            "pnl": pnl,
-                            "return": pnl
-                            / (position["size"] * position["entry_price"]),
-                        }
-                    )
+                    entry_i, entry_price, size = position
+                    capital += size * current_price * (1 - commission)
+
+                    entry_idx[n] = entry_i
+                    exit_idx[n] = i
+                    entry_prices[n] = entry_price
+                    exit_prices[n] = current_price
+                    sizes[n] = size
+                    n += 1
 
                     position = None
 
-        # Calculate metrics
-        total_trades = len(trades)
-        winning_trades = len([t for t in trades if t["pnl"] > 0])
-        losing_trades = len([t for t in trades if t["pnl"] < 0])
+        # Calculate metrics with one vectorized pass per figure
+        entry_prices = entry_prices[:n]
+        exit_prices = exit_prices[:n]
+        sizes = sizes[:n]
+        pnls = sizes * (exit_prices - entry_prices)
+        returns = pnls / (sizes * entry_prices)
+
+        total_trades = n
+        winning_trades = int((pnls > 0).sum())
+        losing_trades = int((pnls < 0).sum())
 
         if total_trades > 0:
             win_rate = winning_trades / total_trades
-            avg_return = sum(t["return"] for t in trades) / total_trades
+            avg_return = float(returns.mean())
             total_return = (capital - initial_capital) / initial_capital
         else:
             win_rate = 0
             avg_return = 0
             total_return = 0
 
+        trades = list(
+            map(
+                BacktestTrade._make,
+                zip(
+                    index[entry_idx[:n]],
+                    index[exit_idx[:n]],
+                    entry_prices.tolist(),
+                    exit_prices.tolist(),
+                    sizes.tolist(),
+                    pnls.tolist(),
+                    returns.tolist(),
+                ),
+            )
+        )
+
         return {
             "total_trades": total_trades,
             "winning_trades": winning_trades,
@@ -1,16 +1,19 @@
-from typing import Optional
+from typing import Any, Optional, Tuple
 import pandas as pd
 import numpy as np
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import lru_cache
+from app.core.compat import DATACLASS_SLOTS
 from app.services.strategies.base import (
     BaseStrategy,
     StrategyParameters,
     TradingSignal,
     SignalDirection,
 )
+from app.services.strategies._ema_loops import ema_alpha, triple_ewm
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class EMACrossoverParameters(StrategyParameters):
     """Parameters specific to EMA Crossover strategy"""
 
@@ -19,6 +22,57 @@ class EMACrossoverParameters(StrategyParameters):
     signal_ema_period: int = 9  # For MACD-like signal smoothing
     use_volume_filter: bool = True
     volume_threshold: float = 1.5  # Volume must be X times average
+    # Store indicator columns as float32 (half the memory bandwidth); crossovers
+    # within float32 rounding of each other may then resolve differently
+    use_float32: bool = False
+
+    # EMA smoothing factors, derived from the periods in __post_init__
+    alpha_fast: float = field(init=False, repr=False, compare=False)
+    alpha_slow: float = field(init=False, repr=False, compare=False)
+    alpha_signal: float = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.alpha_fast = ema_alpha(self.fast_ema_period)
+        self.alpha_slow = ema_alpha(self.slow_ema_period)
+        self.alpha_signal = ema_alpha(self.signal_ema_period)
+
+
+@dataclass(**DATACLASS_SLOTS)
+class _EMAState:
+    """EMA recurrence state at the last bar of a frame"""
+
+    length: int
+    last_index: Any
+    last_close: float
+    ema_fast: float
+    ema_slow: float
+    signal_line: float
+    side: int  # +1/-1/0 for ema_diff above/below/on the signal line
+    prev_side: int
+
+
+def _side(value: float) -> int:
+    """Sign of value as an int"""
+    return int(value > 0) - int(value < 0)
+
+
+def _rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing mean over up to window values (like rolling(min_periods=1))"""
+    if np.isnan(values).any():
+        # A NaN would poison every later cumulative sum; pandas skips them
+        return (
+            pd.Series(values, copy=False)
+            .rolling(window=window, min_periods=1)
+            .mean()
+            .to_numpy()
+        )
+
+    csum = np.cumsum(values)
+    out = np.empty_like(csum)
+    head = min(window, len(values))
+    out[:head] = csum[:head] / np.arange(1, head + 1)
+    out[window:] = (csum[window:] - csum[:-window]) / window
+    return out
 
 
 class EMACrossoverStrategy(BaseStrategy):
@@ -31,9 +85,14 @@ class EMACrossoverStrategy(BaseStrategy):
     - Optional volume filter for confirmation
     """
 
+    # Beyond this many new bars a full recalculation is cheaper
+    INCREMENTAL_MAX_BARS = 64
+
     def __init__(self, parameters: EMACrossoverParameters):
         super().__init__(parameters)
         self.params: EMACrossoverParameters = parameters
+        # EMA state as of the last frame passed to generate_signals
+        self._ema_state: Optional[_EMAState] = None
 
     def get_required_lookback(self) -> int:
         """Return the number of candles needed for calculations"""
@@ -41,134 +100,297 @@ class EMACrossoverStrategy(BaseStrategy):
 
     def calculate_indicators(self, data: pd.DataFrame) -> pd.DataFrame:
         """Calculate EMAs and related indicators"""
-        df = data.copy()
-
-        # Calculate EMAs
-        df["ema_fast"] = (
-            df["close"].ewm(span=self.params.fast_ema_period, adjust=False).mean()
-        )
-
-        df["ema_slow"] = (
-            df["close"].ewm(span=self.params.slow_ema_period, adjust=False).mean()
-        )
-
-        # Calculate MACD-like indicators
-        df["ema_diff"] = df["ema_fast"] - df["ema_slow"]
-        df["signal_line"] = (
-            df["ema_diff"].ewm(span=self.params.signal_ema_period, adjust=False).mean()
+        # Shallow copy: OHLCV arrays are shared with data (never written to),
+        # and the indicator columns below are only added to the new frame
+        df = data.copy(deep=False)
+
+        dtype = np.float32 if self.params.use_float32 else np.float64
+
+        # Calculate EMAs and MACD-like indicators in one pass
+        ema_fast, ema_slow, ema_diff, signal_line = triple_ewm(
+            df["close"].to_numpy(dtype=dtype),
+            self.params.alpha_fast,
+            self.params.alpha_slow,
+            self.params.alpha_signal,
         )
-
-        # Calculate crossover signals
-        df["crossover"] = 0
-        df.loc[df["ema_diff"] > df["signal_line"], "crossover"] = 1
-        df.loc[df["ema_diff"] < df["signal_line"], "crossover"] = -1
-
-        # Detect actual crossover points
-        df["signal"] = df["crossover"].diff()
+        df["ema_fast"] = ema_fast
+        df["ema_slow"] = ema_slow
+        df["ema_diff"] = ema_diff
+        df["signal_line"] = signal_line
+
+        # Detect crossover points: +-1 above/below the signal line (0 on it or
+        # where the EMAs are still NaN), and a change of side shows up as a
+        # non-zero difference
+        distance = ema_diff - signal_line
+        side = (distance > 0).astype(np.int8) - (distance < 0).astype(np.int8)
+        signal = np.zeros_like(side)
+        np.subtract(side[1:], side[:-1], out=signal[1:])
+        df["signal"] = signal
 
         # Volume analysis
         if self.params.use_volume_filter:
-            df["volume_sma"] = df["volume"].rolling(window=20, min_periods=1).mean()
-            df["volume_ratio"] = df["volume"] / df["volume_sma"]
+            volume = df["volume"].to_numpy(dtype=np.float64)
+            volume_sma = _rolling_mean(volume, 20)
+            df["volume_sma"] = volume_sma.astype(dtype, copy=False)
+            df["volume_ratio"] = (volume / volume_sma).astype(dtype, copy=False)
 
         return df
 
     def generate_signals(self, data: pd.DataFrame) -> Optional[TradingSignal]:
         """Generate trading signal based on current data"""
-        # Calculate indicators if not already done
-        if "ema_fast" not in data.columns:
+        if "ema_fast" in data.columns:
+            return self.generate_signal_at(data, len(data) - 1)
+
+        # Live data usually extends the previous frame by a bar or two, so
+        # advance the EMA recurrence instead of recalculating all indicators
+        state = self._advance_ema_state(data)
+        if state is None:
             data = self.calculate_indicators(data)
+            self._ema_state = self._seed_ema_state(data)
+            return self.generate_signal_at(data, len(data) - 1)
 
-        # Get the last row
-        last_row = data.iloc[-1]
-        prev_row = data.iloc[-2] if len(data) > 1 else None
+        self._ema_state = state
+        signal_value = state.side - state.prev_side
+        if signal_value == 0:
+            return None
 
-        # Check for crossover signal
-        signal_value = last_row["signal"]
+        return self._build_signal(
+            data,
+            len(data) - 1,
+            signal_value,
+            state.ema_fast,
+            state.ema_slow,
+            state.ema_fast - state.ema_slow,
+            self._latest_volume_ratio(data),
+        )
 
-        # No signal if no crossover
-        if pd.isna(signal_value) or signal_value == 0:
+    def generate_signal_at(
+        self, data: pd.DataFrame, i: int
+    ) -> Optional[TradingSignal]:
+        """Generate trading signal for candle i of data with indicators"""
+        # Check for crossover signal. Read single cells with .iat rather than
+        # building a row Series with data.iloc[i].
+        signal_value = float(data["signal"].iat[i])
+
+        # No signal if no crossover (NaN is the only value unequal to itself,
+        # a plain float comparison rather than a pd.isna dispatch)
+        if signal_value != signal_value or signal_value == 0.0:
             return None
 
+        has_volume_ratio = "volume_ratio" in data.columns
+        return self._build_signal(
+            data,
+            i,
+            signal_value,
+            float(data["ema_fast"].iat[i]),
+            float(data["ema_slow"].iat[i]),
+            float(data["ema_diff"].iat[i]),
+            float(data["volume_ratio"].iat[i]) if has_volume_ratio else 1.0,
+        )
+
+    def _build_signal(
+        self,
+        data: pd.DataFrame,
+        i: int,
+        signal_value: float,
+        ema_fast: float,
+        ema_slow: float,
+        ema_diff: float,
+        volume_ratio: float,
+    ) -> Optional[TradingSignal]:
+        """Turn a crossover at candle i into a trading signal"""
         # Apply volume filter if enabled
         if self.params.use_volume_filter:
-            if last_row["volume_ratio"] < self.params.volume_threshold:
-                self.log_event(
-                    "Signal filtered due to low volume",
-                    symbol=self.params.symbol,
-                    volume_ratio=last_row["volume_ratio"],
+            if volume_ratio < self.params.volume_threshold:
+                self._log.info(
+                    "Signal filtered due to low volume", volume_ratio=volume_ratio
                 )
                 return None
 
+        close = float(data["close"].iat[i])
+
         # Determine signal direction
         if signal_value > 0:  # Bullish crossover
             direction = SignalDirection.LONG
             strength = min(abs(signal_value), 1.0)
 
             # Calculate stop loss and take profit
-            atr = self._calculate_atr(data, period=14)
-            stop_loss = last_row["close"] - (2 * atr)
-            take_profit = last_row["close"] + (3 * atr)
+            atr = float(
+                self._calculate_atr(data.iloc[max(0, i - 14) : i + 1], period=14)
+            )
+            stop_loss = close - (2 * atr)
+            take_profit = close + (3 * atr)
 
         elif signal_value < 0:  # Bearish crossover
             direction = SignalDirection.SHORT
             strength = min(abs(signal_value), 1.0)
 
             # Calculate stop loss and take profit
-            atr = self._calculate_atr(data, period=14)
-            stop_loss = last_row["close"] + (2 * atr)
-            take_profit = last_row["close"] - (3 * atr)
+            atr = float(
+                self._calculate_atr(data.iloc[max(0, i - 14) : i + 1], period=14)
+            )
+            stop_loss = close + (2 * atr)
+            take_profit = close - (3 * atr)
 
         else:
             return None
 
         # Create trading signal
         signal = TradingSignal(
-            timestamp=last_row.name
-            if hasattr(last_row, "name")
-            else pd.Timestamp.now(),
+            timestamp=data.index[i],
             symbol=self.params.symbol,
             direction=direction,
             strength=strength,
-            entry_price=last_row["close"],
+            entry_price=close,
             stop_loss=stop_loss,
             take_profit=take_profit,
             metadata={
                 "strategy": self.name,
-                "ema_fast": last_row["ema_fast"],
-                "ema_slow": last_row["ema_slow"],
-                "ema_diff": last_row["ema_diff"],
-                "volume_ratio": last_row.get("volume_ratio", 1.0),
+                "ema_fast": ema_fast,
+                "ema_slow": ema_slow,
+                "ema_diff": ema_diff,
+                "volume_ratio": volume_ratio,
             },
         )
 
-        self.log_event(
-            "Signal generated",
-            signal=signal.direction.value,
-            symbol=signal.symbol,
-            strength=signal.strength,
+        self._log.info(
+            "Signal generated", signal=direction.value, strength=strength
         )
 
         return signal
 
+    def _seed_ema_state(self, data: pd.DataFrame) -> Optional["_EMAState"]:
+        """Capture the latest EMA values from a frame with indicators"""
+        n = len(data)
+        if n == 0:
+            return None
+
+        signal_line = data["signal_line"].to_numpy()
+        diff = data["ema_diff"].to_numpy()
+        last_side = _side(diff[-1] - signal_line[-1])
+        prev_side = _side(diff[-2] - signal_line[-2]) if n > 1 else last_side
+
+        return _EMAState(
+            length=n,
+            last_index=data.index[-1],
+            last_close=float(data["close"].iat[-1]),
+            ema_fast=float(data["ema_fast"].iat[-1]),
+            ema_slow=float(data["ema_slow"].iat[-1]),
+            signal_line=float(signal_line[-1]),
+            side=last_side,
+            prev_side=prev_side,
+        )
+
+    def _advance_ema_state(self, data: pd.DataFrame) -> Optional["_EMAState"]:
+        """Advance cached EMA state over bars appended since the last call"""
+        state = self._ema_state
+        n = len(data)
+        if (
+            state is None
+            or n < state.length
+            or n - state.length > self.INCREMENTAL_MAX_BARS
+        ):
+            return None
+
+        # The previous last bar must still be there, unchanged
+        last = state.length - 1
+        close = data["close"].to_numpy(dtype=np.float64)
+        if data.index[last] != state.last_index or close[last] != state.last_close:
+            return None
+
+        # pandas skips missing closes rather than running the recurrence
+        # through them, so NaN bars take the full recalculation
+        new_close = close[state.length :]
+        if np.isnan(new_close).any():
+            return None
+
+        a_fast = self.params.alpha_fast
+        a_slow = self.params.alpha_slow
+        a_sig = self.params.alpha_signal
+        fast, slow, sig = state.ema_fast, state.ema_slow, state.signal_line
+        side, prev_side = state.side, state.prev_side
+
+        for x in new_close.tolist():
+            fast = a_fast * x + (1.0 - a_fast) * fast
+            slow = a_slow * x + (1.0 - a_slow) * slow
+            diff = fast - slow
+            sig = a_sig * diff + (1.0 - a_sig) * sig
+            prev_side, side = side, _side(diff - sig)
+
+        return _EMAState(
+            length=n,
+            last_index=data.index[-1],
+            last_close=float(close[-1]),
+            ema_fast=fast,
+            ema_slow=slow,
+            signal_line=sig,
+            side=side,
+            prev_side=prev_side,
+        )
+
+    def _latest_volume_ratio(self, data: pd.DataFrame) -> float:
+        """Latest volume relative to its 20-bar average"""
+        if not self.params.use_volume_filter:
+            return 1.0
+
+        volume = data["volume"].to_numpy(dtype=np.float64)[-20:]
+        return float(volume[-1] / volume.mean())
+
     def _calculate_atr(self, data: pd.DataFrame, period: int = 14) -> float:
         """Calculate Average True Range for stop loss/take profit"""
-        high = data["high"]
-        low = data["low"]
-        close = data["close"]
+        # Only the last ATR value is used, so work on the trailing window
+        # (plus one bar for the previous close) instead of the full history
+        high = data["high"].to_numpy(dtype=np.float64)[-(period + 1) :]
+        low = data["low"].to_numpy(dtype=np.float64)[-(period + 1) :]
+        close = data["close"].to_numpy(dtype=np.float64)[-(period + 1) :]
 
-        # Calculate True Range
-        tr1 = high - low
-        tr2 = abs(high - close.shift())
-        tr3 = abs(low - close.shift())
+        # True Range; the first bar has no previous close
+        tr = high - low
+        prev_close = close[:-1]
+        np.maximum(tr[1:], np.abs(high[1:] - prev_close), out=tr[1:])
+        np.maximum(tr[1:], np.abs(low[1:] - prev_close), out=tr[1:])
 
-        tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
+        atr = float(tr[-period:].mean())
 
-        # Calculate ATR
-        atr = tr.rolling(window=period, min_periods=1).mean()
+        return atr if atr == atr else float(high[-1] - low[-1])
 
-        return (
-            atr.iloc[-1]
-            if not pd.isna(atr.iloc[-1])
-            else (high.iloc[-1] - low.iloc[-1])
+
+def get_ema_crossover_strategy(
+    symbol: str, timeframe: str, lookback_period: int, **params: Any
+) -> EMACrossoverStrategy:
+    """
+    Get a shared EMA crossover strategy for a symbol and parameter set
+
+    OPTIMIZATION: Live signal generation keeps incremental EMA state on the
+    strategy instance, so reusing one instance per (symbol, parameters) lets
+    repeated calls advance by the new bars instead of recomputing the
+    indicators over the full history.
+    """
+    # Sorted so keyword order doesn't split the cache
+    key = tuple(sorted(params.items()))
+    try:
+        hash(key)
+    except TypeError:
+        # Unhashable parameter values can't be cached; build a fresh instance
+        return _build_ema_crossover_strategy(symbol, timeframe, lookback_period, key)
+    return _cached_ema_crossover_strategy(symbol, timeframe, lookback_period, key)
+
+
+def _build_ema_crossover_strategy(
+    symbol: str,
+    timeframe: str,
+    lookback_period: int,
+    params: Tuple[Tuple[str, Any], ...],
+) -> EMACrossoverStrategy:
+    """Create an EMA crossover strategy from normalized parameters"""
+    return EMACrossoverStrategy(
+        EMACrossoverParameters(
+            symbol=symbol,
+            timeframe=timeframe,
+            lookback_period=lookback_period,
+            **dict(params),
         )
+    )
+
+
+_cached_ema_crossover_strategy = lru_cache(maxsize=256)(_build_ema_crossover_strategy)
@@ -1,36 +1,142 @@
 """Celery tasks for async processing."""
 import asyncio
+import inspect
+import threading
+import time
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional
-from celery import Task
+from celery import Task, group
+from celery.backends.base import KeyValueStoreBackend
 from celery.exceptions import SoftTimeLimitExceeded
+from celery.signals import worker_process_init, worker_process_shutdown
 from app.core.celery_app import celery_app
 from app.core.logger import get_logger
-from app.services.backtester import Backtester
+from app.services.backtester import backtester
 from app.services.ai_service import AIService
-from app.models.tradingview import TradingViewAlert
 from app.models.backtest import BacktestRequest, BacktestResult
 
+try:
+    import uvloop
+except ImportError:  # pragma: no cover - installed with uvicorn[standard] on POSIX
+    uvloop = None
+
 logger = get_logger(__name__)
 
+# Minimum progress step (percent) and interval (seconds) between backtest
+# progress updates sent to the result backend
+PROGRESS_MIN_STEP = 1
+PROGRESS_MIN_INTERVAL = 0.25
+
+# Result backend key prefix for full backtest results
+BACKTEST_RESULT_KEY_PREFIX = "backtest-result-"
+
+
+# OPTIMIZATION: Async tasks reuse one event loop per worker thread instead of
+# creating and closing a loop for every task invocation. The loops are uvloop
+# loops when it is installed, as uvicorn already does for the API server.
+_loop_local = threading.local()
+_loops: List[asyncio.AbstractEventLoop] = []
+_loops_lock = threading.Lock()
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """Get this thread's persistent event loop, creating it if needed."""
+    loop = getattr(_loop_local, "loop", None)
+    if loop is None or loop.is_closed():
+        loop = uvloop.new_event_loop() if uvloop else asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        _loop_local.loop = loop
+        with _loops_lock:
+            _loops.append(loop)
+    return loop
+
+
+def _close_loops() -> None:
+    """Close every event loop created by this process."""
+    with _loops_lock:
+        loops = _loops[:]
+        _loops.clear()
+    for loop in loops:
+        if not loop.is_closed():
+            loop.close()
+    _loop_local.loop = None
+
+
+@worker_process_init.connect
+def _init_worker_loop(**kwargs) -> None:
+    """Start each forked worker with its own loop, not the parent's."""
+    with _loops_lock:
+        _loops.clear()
+    _loop_local.loop = None
+    _get_loop()
+
+
+@worker_process_shutdown.connect
+def _shutdown_worker_loop(**kwargs) -> None:
+    """Close the worker's event loops on shutdown."""
+    _close_loops()
+
 
 class AsyncTask(Task):
     """Base task that properly handles async functions."""
-    
+
+    def __call__(self, *args, **kwargs):
+        """Run the task, driving coroutine results on the worker's loop."""
+        # Decorating an ``async def`` replaces run(), so the task body returns
+        # a coroutine that still has to be executed here
+        result = super().__call__(*args, **kwargs)
+        if inspect.isawaitable(result):
+            return _get_loop().run_until_complete(result)
+        return result
+
     def run(self, *args, **kwargs):
         """Run the async task in an event loop."""
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            return loop.run_until_complete(self._async_run(*args, **kwargs))
-        finally:
-            loop.close()
+        return self._async_run(*args, **kwargs)
     
     async def _async_run(self, *args, **kwargs):
         """Override this method in subclasses."""
         raise NotImplementedError
 
 
+def _store_backtest_result(result: BacktestResult) -> Optional[str]:
+    """
+    Store a full backtest result in the result backend
+
+    OPTIMIZATION: Backtest results can hold thousands of trades. Storing the
+    blob once under its own key (expiring with the other task results) keeps
+    it out of the serialized task result that every status poll fetches.
+
+    Returns:
+        The result key, or None if the backend cannot store raw values
+    """
+    backend = celery_app.backend
+    if not isinstance(backend, KeyValueStoreBackend):
+        return None
+
+    key = f"{BACKTEST_RESULT_KEY_PREFIX}{result.id}"
+    try:
+        backend.set(key, result.model_dump_json())
+    except Exception as e:
+        logger.warning("Failed to store backtest result", key=key, error=str(e))
+        return None
+    return key
+
+
+def load_backtest_result(result_key: str) -> Optional[BacktestResult]:
+    """Load a backtest result stored by run_backtest, if it has not expired."""
+    if not result_key.startswith(BACKTEST_RESULT_KEY_PREFIX):
+        return None
+
+    backend = celery_app.backend
+    if not isinstance(backend, KeyValueStoreBackend):
+        return None
+
+    raw = backend.get(result_key)
+    if raw is None:
+        return None
+    return BacktestResult.model_validate_json(raw)
+
+
 @celery_app.task(base=AsyncTask, bind=True, name="app.workers.tasks.run_backtest")
 async def run_backtest(self, request_data: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -59,11 +165,24 @@ async def run_backtest(self, request_data: Dict[str, Any]) -> Dict[str, Any]:
             }
         )
         
-        # Run the backtest
-        backtester = Backtester()
-        
         # Progress callback
+        # OPTIMIZATION: Every update_state is a round-trip to the result
+        # backend, so only forward progress that advanced by at least 1% or
+        # after 250ms; completion is always forwarded.
+        last_progress = 0
+        last_update = time.monotonic()
+
         def update_progress(progress: int, message: str):
+            nonlocal last_progress, last_update
+            now = time.monotonic()
+            if (
+                progress < 100
+                and progress - last_progress < PROGRESS_MIN_STEP
+                and now - last_update < PROGRESS_MIN_INTERVAL
+            ):
+                return
+            last_progress = progress
+            last_update = now
             self.update_state(
                 state="PROGRESS",
                 meta={
@@ -73,6 +192,8 @@ async def run_backtest(self, request_data: Dict[str, Any]) -> Dict[str, Any]:
                 }
             )
         
+        # Run the backtest on the shared backtester, so its historical data
+        # and indicator caches carry over between tasks in this worker
         result = await backtester.run_backtest_async(
             backtest_request,
             progress_callback=update_progress
@@ -85,8 +206,28 @@ async def run_backtest(self, request_data: Dict[str, Any]) -> Dict[str, Any]:
             total_return=result.metrics.total_return
         )
         
-        # Return serializable result
-        return result.model_dump()
+        # Keep the full result out of the task message; return a pointer and
+        # a small summary instead
+        summary = {
+            "id": result.id,
+            "status": result.status.value,
+            "strategy": result.strategy,
+            "symbol": result.symbol,
+            "initial_capital": result.initial_capital,
+            "final_capital": result.final_capital,
+            "total_trades": result.metrics.total_trades,
+            "total_return": result.metrics.total_return,
+            "sharpe_ratio": result.metrics.sharpe_ratio,
+            "max_drawdown": result.metrics.max_drawdown,
+        }
+        result_key = _store_backtest_result(result)
+        if result_key is None:
+            return {
+                "result_key": None,
+                "summary": summary,
+                "result": result.model_dump(mode="json"),
+            }
+        return {"result_key": result_key, "summary": summary}
         
     except SoftTimeLimitExceeded:
         logger.error("Backtest task exceeded time limit", task_id=task_id)
@@ -150,7 +291,7 @@ def process_webhook(self, alert_data: Dict[str, Any]) -> Dict[str, Any]:
     Process a TradingView webhook alert asynchronously.
     
     This task:
-    1. Validates the alert
+    1. Takes an alert already validated by the API
     2. Checks strategy availability
     3. Executes the trade if approved
     4. Logs the result
@@ -159,13 +300,14 @@ def process_webhook(self, alert_data: Dict[str, Any]) -> Dict[str, Any]:
     logger.info("Processing webhook", task_id=task_id, alert=alert_data)
     
     try:
-        # Convert to alert model
-        alert = TradingViewAlert(**alert_data)
-        
+        # alert_data was validated as a TradingViewAlert and dumped in JSON
+        # mode before it was queued, so it is not parsed into a model again
+        symbol = alert_data["symbol"]
+
         # Update task state
         self.update_state(
             state="PROGRESS",
-            meta={"status": "Validating alert..."}
+            meta={"status": "Processing alert..."}
         )
         
         # TODO: Implement actual webhook processing
@@ -180,7 +322,7 @@ def process_webhook(self, alert_data: Dict[str, Any]) -> Dict[str, Any]:
             "alert_id": alert_data.get("alert_id"),
             "status": "processed",
             "action_taken": "simulated",
-            "message": f"Alert for {alert.symbol} processed successfully"
+            "message": f"Alert for {symbol} processed successfully"
         }
         
         logger.info("Webhook processed", task_id=task_id, result=result)
@@ -205,10 +347,12 @@ def check_strategy_health() -> Dict[str, Any]:
     
     try:
         # TODO: Implement strategy health check
-        # 1. Query active strategies from database
-        # 2. Check recent performance metrics
-        # 3. Compare against thresholds
-        # 4. Send alerts if needed
+        # 1. Aggregate recent performance in the database with one query, e.g.
+        #    SELECT strategy_id, AVG(pnl), COUNT(*) FROM trades
+        #    WHERE ts > now() - interval '1 day' GROUP BY strategy_id
+        #    (do not load trades and loop over them in Python)
+        # 2. Compare the aggregated rows against thresholds
+        # 3. Send alerts if needed
         
         result = {
             "timestamp": datetime.utcnow().isoformat(),
@@ -242,10 +386,11 @@ def cleanup_old_results() -> Dict[str, Any]:
         cutoff_date = datetime.utcnow() - timedelta(days=30)
         
         # TODO: Implement cleanup logic
-        # 1. Query old backtest results
-        # 2. Archive important ones to S3/storage
-        # 3. Delete from database
-        # 4. Clean up file system
+        # 1. Archive important results older than cutoff_date to S3/storage
+        # 2. Delete the rest in a single statement, e.g.
+        #    delete(BacktestResult).where(created_at < cutoff_date)
+        #    .returning(id), instead of deleting row by row
+        # 3. Clean up file system
         
         result = {
             "timestamp": datetime.utcnow().isoformat(),
@@ -262,6 +407,32 @@ def cleanup_old_results() -> Dict[str, Any]:
         raise
 
 
+@celery_app.task(name="app.workers.tasks.analyze_single_signal")
+def analyze_single_signal(signal: Dict[str, Any], index: int) -> Dict[str, Any]:
+    """Analyze one trading signal of a batch."""
+    try:
+        # Process the signal
+        # TODO: Implement actual signal processing
+        return {
+            "signal_id": signal.get("id", index),
+            "symbol": signal.get("symbol"),
+            "status": "processed",
+            "recommendation": "hold"
+        }
+
+    except Exception as e:
+        logger.error(
+            "Failed to process signal",
+            signal_index=index,
+            error=str(e)
+        )
+        return {
+            "signal_id": signal.get("id", index),
+            "status": "failed",
+            "error": str(e)
+        }
+
+
 @celery_app.task(bind=True, name="app.workers.tasks.batch_analyze_signals")
 def batch_analyze_signals(self, signals: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
@@ -271,97 +442,78 @@ def batch_analyze_signals(self, signals: List[Dict[str, Any]]) -> List[Dict[str,
     - Processing multiple alerts at once
     - Reprocessing historical signals
     - Bulk strategy testing
+
+    OPTIMIZATION: Signals are fanned out as a group of analyze_single_signal
+    tasks that run in parallel across workers. The batch task is replaced by
+    the group rather than blocking a worker while waiting on it, and its
+    result is the list of per-signal results.
     """
     task_id = self.request.id
     total_signals = len(signals)
     logger.info("Starting batch signal analysis", task_id=task_id, count=total_signals)
-    
-    results = []
-    
-    for i, signal in enumerate(signals):
-        try:
-            # Update progress
-            self.update_state(
-                state="PROGRESS",
-                meta={
-                    "current": i + 1,
-                    "total": total_signals,
-                    "status": f"Processing signal {i + 1} of {total_signals}"
-                }
-            )
-            
-            # Process each signal
-            # TODO: Implement actual signal processing
-            result = {
-                "signal_id": signal.get("id", i),
-                "symbol": signal.get("symbol"),
-                "status": "processed",
-                "recommendation": "hold"
-            }
-            
-            results.append(result)
-            
-        except Exception as e:
-            logger.error(
-                "Failed to process signal",
-                task_id=task_id,
-                signal_index=i,
-                error=str(e)
-            )
-            results.append({
-                "signal_id": signal.get("id", i),
-                "status": "failed",
-                "error": str(e)
-            })
-    
-    logger.info(
-        "Batch analysis completed",
-        task_id=task_id,
-        total=total_signals,
-        successful=sum(1 for r in results if r["status"] == "processed")
+
+    if not signals:
+        return []
+
+    self.update_state(
+        state="PROGRESS",
+        meta={
+            "current": 0,
+            "total": total_signals,
+            "status": f"Dispatching {total_signals} signals"
+        }
     )
-    
-    return results
+
+    job = group(
+        analyze_single_signal.s(signal, i) for i, signal in enumerate(signals)
+    )
+    return self.replace(job)
 
 
 # Task status helper
 def get_task_status(task_id: str) -> Dict[str, Any]:
-    """Get the status of a Celery task."""
-    from celery.result import AsyncResult
-    
-    result = AsyncResult(task_id, app=celery_app)
+    """
+    Get the status of a Celery task.
+
+    OPTIMIZATION: Reads the task meta from the result backend once. Each
+    AsyncResult.state/.info/.result access on an unfinished task is a
+    separate backend round-trip.
+    """
+    meta = celery_app.backend.get_task_meta(task_id)
+    state = meta["status"]
+    info = meta.get("result")
     
-    if result.state == "PENDING":
+    if state == "PENDING":
         return {
             "task_id": task_id,
-            "state": result.state,
+            "state": state,
             "current": 0,
             "total": 100,
             "status": "Task pending..."
         }
-    elif result.state == "PROGRESS":
+    elif state == "PROGRESS":
         return {
             "task_id": task_id,
-            "state": result.state,
-            "current": result.info.get("current", 0),
-            "total": result.info.get("total", 100),
-            "status": result.info.get("status", "")
+            "state": state,
+            "current": info.get("current", 0),
+            "total": info.get("total", 100),
+            "status": info.get("status", "")
         }
-    elif result.state == "SUCCESS":
+    elif state == "SUCCESS":
         return {
             "task_id": task_id,
-            "state": result.state,
+            "state": state,
             "current": 100,
             "total": 100,
             "status": "Task completed successfully",
-            "result": result.result
+            "result": info
         }
     else:  # FAILURE
         return {
             "task_id": task_id,
-            "state": result.state,
+            "state": state,
             "current": 0,
             "total": 100,
-            "status": str(result.info),
+            "status": str(info),
             "error": True
-        }
\ No newline at end of file
+        }
@@ -0,0 +1,37 @@
+"""Shared pieces of the API test scripts (console, HTTP client, probing)."""
+import httpx
+from rich.console import Console
+from rich.table import Table
+
+BASE_URL = "http://localhost:8000"
+
+# One console for all scripts, so output from run_all_tests.py interleaves cleanly
+CONSOLE = Console()
+
+
+def make_client() -> httpx.AsyncClient:
+    """Create the HTTP client shared by all probes (keeps connections alive)."""
+    return httpx.AsyncClient(
+        base_url=BASE_URL,
+        timeout=10.0,
+        limits=httpx.Limits(max_keepalive_connections=32),
+    )
+
+
+async def probe(client: httpx.AsyncClient, method: str, path: str, data=None) -> httpx.Response:
+    """Send one endpoint probe."""
+    if method == "GET":
+        return await client.get(path)
+    return await client.post(path, json=dict(data) if data is not None else None)
+
+
+def render_results(rows, title: str) -> Table:
+    """Build the results table once all probes have finished."""
+    table = Table(title=title, show_header=True)
+    table.add_column("Method", style="cyan")
+    table.add_column("Path", style="blue")
+    table.add_column("Status", style="green")
+    table.add_column("Description")
+    for row in rows:
+        table.add_row(*row)
+    return table
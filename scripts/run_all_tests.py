@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Run every API test script against the local server in one process.
+
+All scripts share a single HTTP client (and connection pool) and console,
+see _test_harness.py.
+"""
+import asyncio
+
+import httpx
+
+import test_new_endpoints
+import test_refactoring
+import test_webhook_flow
+from _test_harness import make_client
+
+
+async def run_all(client: httpx.AsyncClient):
+    """Run the test scripts one after another on the shared client."""
+    await test_new_endpoints.run(client)
+    await test_refactoring.run(client)
+    await test_webhook_flow.run(client)
+
+
+async def main():
+    async with make_client() as client:
+        await run_all(client)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
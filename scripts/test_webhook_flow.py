@@ -10,17 +10,18 @@ Test script to demonstrate the complete TradingView webhook flow:
 import asyncio
 import json
 from datetime import datetime, timedelta
+from types import MappingProxyType
+from typing import Any, Mapping
 import httpx
-from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
 from rich import print as rprint
 
-console = Console()
+from _test_harness import CONSOLE as console, make_client
 
-# Test webhook payloads
-WEBHOOK_PAYLOADS = {
-    "buy_signal": {
+# Test webhook payloads (read-only, shared by every step that sends them)
+WEBHOOK_PAYLOADS = MappingProxyType({
+    "buy_signal": MappingProxyType({
         "strategy": "EMA_Crossover",
         "symbol": "BTCUSDT",
         "signal": "buy",
@@ -29,8 +30,8 @@ WEBHOOK_PAYLOADS = {
         "stop_loss": 49000.0,
         "take_profit": 52000.0,
         "message": "EMA12 crossed above EMA26",
-    },
-    "sell_signal": {
+    }),
+    "sell_signal": MappingProxyType({
         "strategy": "EMA_Crossover",
         "symbol": "BTCUSDT",
         "signal": "sell",
@@ -39,39 +40,37 @@ WEBHOOK_PAYLOADS = {
         "stop_loss": 52000.0,
         "take_profit": 49000.0,
         "message": "EMA12 crossed below EMA26",
-    },
-}
+    }),
+})
 
 # Configuration
-BASE_URL = "http://localhost:8000"
 WEBHOOK_SECRET = "your-webhook-secret"  # Should match .env
 
 
-async def test_health_check():
+async def test_health_check(client: httpx.AsyncClient):
     """Test if the API is running"""
     console.print("\n[bold blue]1. Testing Health Check...[/bold blue]")
 
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(f"{BASE_URL}/api/v1/health")
-            if response.status_code == 200:
-                console.print("[green]✓ API is healthy[/green]")
-                console.print(f"Response: {response.json()}")
-                return True
-            else:
-                console.print(
-                    f"[red]✗ Health check failed: {response.status_code}[/red]"
-                )
-                return False
-        except Exception as e:
-            console.print(f"[red]✗ Cannot connect to API: {e}[/red]")
+    try:
+        response = await client.get("/api/v1/health")
+        if response.status_code == 200:
+            console.print("[green]✓ API is healthy[/green]")
+            console.print(f"Response: {response.json()}")
+            return True
+        else:
             console.print(
-                "[yellow]Make sure the API is running: python main.py[/yellow]"
+                f"[red]✗ Health check failed: {response.status_code}[/red]"
             )
             return False
+    except Exception as e:
+        console.print(f"[red]✗ Cannot connect to API: {e}[/red]")
+        console.print(
+            "[yellow]Make sure the API is running: python main.py[/yellow]"
+        )
+        return False
 
 
-async def test_webhook_endpoint(payload: dict):
+async def test_webhook_endpoint(client: httpx.AsyncClient, payload: Mapping[str, Any]):
     """Test sending a webhook signal"""
     console.print(f"\n[bold blue]2. Testing Webhook Endpoint...[/bold blue]")
     console.print(f"Sending {payload['signal']} signal for {payload['symbol']}")
@@ -81,28 +80,27 @@ async def test_webhook_endpoint(payload: dict):
         "Authorization": f"Bearer {WEBHOOK_SECRET}",
     }
 
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.post(
-                f"{BASE_URL}/api/v1/webhook/tradingview", json=payload, headers=headers
-            )
+    try:
+        response = await client.post(
+            "/api/v1/webhook/tradingview", json=dict(payload), headers=headers
+        )
 
-            if response.status_code == 200:
-                console.print("[green]✓ Webhook processed successfully[/green]")
-                result = response.json()
-                console.print(f"Alert ID: {result.get('alert_id')}")
-                return True
-            else:
-                console.print(f"[red]✗ Webhook failed: {response.status_code}[/red]")
-                console.print(f"Response: {response.text}")
-                return False
-
-        except Exception as e:
-            console.print(f"[red]✗ Error sending webhook: {e}[/red]")
+        if response.status_code == 200:
+            console.print("[green]✓ Webhook processed successfully[/green]")
+            result = response.json()
+            console.print(f"Alert ID: {result.get('alert_id')}")
+            return True
+        else:
+            console.print(f"[red]✗ Webhook failed: {response.status_code}[/red]")
+            console.print(f"Response: {response.text}")
             return False
 
+    except Exception as e:
+        console.print(f"[red]✗ Error sending webhook: {e}[/red]")
+        return False
 
-async def test_backtest():
+
+async def test_backtest(client: httpx.AsyncClient):
     """Run a backtest with the EMA strategy"""
     console.print("\n[bold blue]3. Running Backtest...[/bold blue]")
 
@@ -125,26 +123,25 @@ async def test_backtest():
 
     console.print(f"Testing period: {start_date.date()} to {end_date.date()}")
 
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.post(
-                f"{BASE_URL}/api/v1/backtest",
-                json=backtest_request,
-                timeout=30.0,  # Longer timeout for backtest
-            )
-
-            if response.status_code == 200:
-                console.print("[green]✓ Backtest completed successfully[/green]")
-                return response.json()
-            else:
-                console.print(f"[red]✗ Backtest failed: {response.status_code}[/red]")
-                console.print(f"Response: {response.text}")
-                return None
+    try:
+        response = await client.post(
+            "/api/v1/backtest",
+            json=backtest_request,
+            timeout=30.0,  # Longer timeout for backtest
+        )
 
-        except Exception as e:
-            console.print(f"[red]✗ Error running backtest: {e}[/red]")
+        if response.status_code == 200:
+            console.print("[green]✓ Backtest completed successfully[/green]")
+            return response.json()
+        else:
+            console.print(f"[red]✗ Backtest failed: {response.status_code}[/red]")
+            console.print(f"Response: {response.text}")
             return None
 
+    except Exception as e:
+        console.print(f"[red]✗ Error running backtest: {e}[/red]")
+        return None
+
 
 def display_backtest_results(results: dict):
     """Display backtest results in a nice format"""
@@ -195,7 +192,7 @@ def display_backtest_results(results: dict):
         console.print(trades_table)
 
 
-async def test_ai_analysis(signal_payload: dict):
+async def test_ai_analysis(client: httpx.AsyncClient, signal_payload: Mapping[str, Any]):
     """Test AI analysis of a trade signal"""
     console.print("\n[bold blue]5. Testing AI Analysis (Optional)...[/bold blue]")
 
@@ -214,21 +211,20 @@ async def test_ai_analysis(signal_payload: dict):
         },
     }
 
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.post(
-                f"{BASE_URL}/api/v1/ai/analyze-trade",
-                json=analysis_request,
-                timeout=30.0,
-            )
+    try:
+        response = await client.post(
+            "/api/v1/ai/analyze-trade",
+            json=analysis_request,
+            timeout=30.0,
+        )
 
-            if response.status_code == 200:
-                console.print("[green]✓ AI Analysis completed[/green]")
-                result = response.json()
+        if response.status_code == 200:
+            console.print("[green]✓ AI Analysis completed[/green]")
+            result = response.json()
 
-                # Display AI insights
-                ai_panel = Panel(
-                    f"""[bold]AI Analysis Results[/bold]
+            # Display AI insights
+            ai_panel = Panel(
+                f"""[bold]AI Analysis Results[/bold]
                     
 Signal Strength: {result.get('signal_strength', 0):.1f}/100
 Risk/Reward: {result.get('risk_reward', 0):.2f}
@@ -241,29 +237,29 @@ Confidence: {result.get('confidence', 0):.1f}%
 [bold]Reasoning:[/bold]
 {result.get('reasoning', 'No reasoning provided')}
 """,
-                    title="Claude AI Analysis",
-                    border_style="blue",
-                )
-                console.print(ai_panel)
-                return True
-            elif response.status_code == 503:
-                console.print(
-                    "[yellow]ℹ AI Analysis not available (API key not configured)[/yellow]"
-                )
-                return False
-            else:
-                console.print(
-                    f"[red]✗ AI Analysis failed: {response.status_code}[/red]"
-                )
-                return False
-
-        except Exception as e:
-            console.print(f"[yellow]ℹ AI Analysis skipped: {e}[/yellow]")
+                title="Claude AI Analysis",
+                border_style="blue",
+            )
+            console.print(ai_panel)
+            return True
+        elif response.status_code == 503:
+            console.print(
+                "[yellow]ℹ AI Analysis not available (API key not configured)[/yellow]"
+            )
+            return False
+        else:
+            console.print(
+                f"[red]✗ AI Analysis failed: {response.status_code}[/red]"
+            )
             return False
 
+    except Exception as e:
+        console.print(f"[yellow]ℹ AI Analysis skipped: {e}[/yellow]")
+        return False
 
-async def main():
-    """Run the complete test flow"""
+
+async def run(client: httpx.AsyncClient):
+    """Run the complete test flow against the given client"""
     console.print(
         Panel.fit(
             "[bold green]TradingView → Webhook → Backtest Flow Test[/bold green]\n"
@@ -273,21 +269,21 @@ async def main():
     )
 
     # Step 1: Health check
-    if not await test_health_check():
+    if not await test_health_check(client):
         return
 
     # Step 2: Test webhook with buy signal
     buy_payload = WEBHOOK_PAYLOADS["buy_signal"]
-    await test_webhook_endpoint(buy_payload)
+    await test_webhook_endpoint(client, buy_payload)
 
     # Step 3: Run backtest
-    backtest_results = await test_backtest()
+    backtest_results = await test_backtest(client)
 
     # Step 4: Display results
     display_backtest_results(backtest_results)
 
     # Step 5: Test AI analysis (optional)
-    await test_ai_analysis(buy_payload)
+    await test_ai_analysis(client, buy_payload)
 
     console.print("\n[bold green]✅ Test flow completed![/bold green]")
     console.print("\n[bold]Next Steps:[/bold]")
@@ -297,5 +293,12 @@ async def main():
     console.print("4. Monitor logs in the 'logs' directory")
 
 
+async def main():
+    """Run the complete test flow"""
+    # One client for the whole flow so connections are reused between steps
+    async with make_client() as client:
+        await run(client)
+
+
 if __name__ == "__main__":
     asyncio.run(main())
@@ -0,0 +1,16 @@
+"""Environment for the test session.
+
+Imported by conftest.py before anything reads settings, so the Settings
+singleton is built once from these values.
+"""
+import os
+
+TEST_ENV = {
+    "ENVIRONMENT": "development",
+    "TRADINGVIEW_WEBHOOK_SECRET": "test_secret",
+    "SECRET_KEY": "test-secret-key",
+    "DATABASE_URL": "sqlite+aiosqlite:///:memory:",
+    "REDIS_URL": "",
+}
+
+os.environ.update(TEST_ENV)
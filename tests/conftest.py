@@ -1,15 +1,14 @@
 """Pytest configuration and fixtures."""
+import asyncio
 import pytest
 import os
-from typing import Generator
-from fastapi.testclient import TestClient
+from typing import TYPE_CHECKING, AsyncGenerator, Generator
 
+# Sets the test environment variables; must run before main/settings import
+from tests import _env  # noqa: F401
 
-# Set test environment variables
-os.environ["ENVIRONMENT"] = "testing"
-os.environ["TRADINGVIEW_WEBHOOK_SECRET"] = "test_secret"
-os.environ["DATABASE_URL"] = "sqlite+aiosqlite:///:memory:"
-os.environ["REDIS_URL"] = "redis://localhost:6379/1"
+if TYPE_CHECKING:
+    from fastapi.testclient import TestClient
 
 
 @pytest.fixture(scope="session")
@@ -20,19 +19,53 @@ def app():
     return _app
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def client(app) -> Generator:
-    """Create test client."""
+    """Create test client (shared, so app startup runs once per session)."""
+    # Imported here so collecting tests that never use the client stays cheap
+    from fastapi.testclient import TestClient
+
     with TestClient(app) as c:
         yield c
 
 
+@pytest.fixture(scope="session")
+def event_loop() -> Generator:
+    """One event loop for the session, so async fixtures can be session-scoped."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(scope="session")
+async def aclient(app) -> AsyncGenerator:
+    """Async client calling the ASGI app directly (no TestClient thread hop)."""
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+@pytest.fixture(autouse=True)
+def _reset_headers(request) -> Generator:
+    """Restore the shared client's headers after each test that uses it."""
+    if "client" not in request.fixturenames:
+        yield
+        return
+
+    client = request.getfixturevalue("client")
+    headers = client.headers.copy()
+    yield
+    client.headers = headers
+
+
 @pytest.fixture
-def authorized_client(client) -> TestClient:
+def authorized_client(client) -> "TestClient":
     """Create test client with authorization headers."""
-    client.headers = {
-        "Authorization": f"Bearer {os.environ['TRADINGVIEW_WEBHOOK_SECRET']}"
-    }
+    client.headers["Authorization"] = (
+        f"Bearer {os.environ['TRADINGVIEW_WEBHOOK_SECRET']}"
+    )
     return client
 
 
@@ -0,0 +1,13 @@
+"""Tests for the AI-enhanced strategy's market context helpers."""
+import numpy as np
+
+from app.services.strategies.ai_enhanced_strategy import _extreme_levels
+
+
+def test_extreme_levels_skip_nan():
+    """Test that support/resistance levels ignore missing bars."""
+    window = np.array([1.0, 5.0, np.nan, 3.0, 4.0])
+
+    assert _extreme_levels(window, largest=True) == [5.0, 4.0, 3.0]
+    assert _extreme_levels(window, largest=False) == [1.0, 3.0, 4.0]
+    assert _extreme_levels(np.array([np.nan, np.nan]), largest=True) == []
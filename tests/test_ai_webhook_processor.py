@@ -0,0 +1,178 @@
+"""Tests for the AI webhook processor's batching queue."""
+import asyncio
+import json
+import re
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.config import settings
+from app.models.tradingview import TradingViewAlert
+from app.services.ai_service import AIService
+from app.services.ai_webhook_processor import AIWebhookProcessor
+
+SYMBOLS = ["BTCUSDT", "ETHUSDT", "SOLUSDT"]
+
+
+class FakeMessages:
+    """Stands in for the async Anthropic client's messages API"""
+
+    def __init__(self, batch_reply):
+        self.batch_reply = batch_reply
+        self.batch_calls = []
+        self.single_calls = []
+
+    async def create(self, messages, **kwargs):
+        prompt = messages[0]["content"]
+        if "Trading Signals:" in prompt:
+            symbols = re.findall(r'"symbol": "(\w+)"', prompt)
+            self.batch_calls.append(symbols)
+            text = self.batch_reply(symbols)
+        else:
+            symbol = re.search(r"- Symbol: (\w+)", prompt).group(1)
+            self.single_calls.append(symbol)
+            if symbol == "SOLUSDT":
+                raise RuntimeError("upstream error")
+            text = json.dumps(_analysis(symbol, "single"))
+        return SimpleNamespace(content=[SimpleNamespace(text=text)])
+
+
+def _analysis(symbol, source):
+    return {"confidence": 80, "recommendations": [], "reasoning": f"{source}:{symbol}"}
+
+
+def _alert(symbol):
+    return TradingViewAlert(
+        strategy="EMA_Crossover", symbol=symbol, signal="buy", price=100.0
+    )
+
+
+@pytest.fixture
+def processor(monkeypatch):
+    """Processor with one worker and a fake Claude client"""
+    monkeypatch.setattr(settings, "ai_webhook_workers", 1)
+    monkeypatch.setattr(settings, "ai_webhook_batch_max", 10)
+    monkeypatch.setattr(settings, "anthropic_api_key", "test-key")
+
+    processor = AIWebhookProcessor(redis_client=None)
+    processor.ai_service = AIService()
+    return processor
+
+
+async def _process(processor, batch_reply, symbols=SYMBOLS):
+    messages = FakeMessages(batch_reply)
+    processor.ai_service.client = SimpleNamespace(messages=messages)
+
+    futures = [await processor.enqueue(_alert(symbol)) for symbol in symbols]
+    results = await asyncio.wait_for(asyncio.gather(*futures), timeout=1)
+    await processor.stop()
+    return messages, results
+
+
+@pytest.mark.asyncio
+async def test_queued_alerts_share_one_batch_call(processor):
+    """Test that alerts queued together are analyzed in one request."""
+    messages, results = await _process(
+        processor,
+        lambda symbols: json.dumps([_analysis(s, "batch") for s in symbols]),
+    )
+
+    assert messages.batch_calls == [SYMBOLS]
+    assert messages.single_calls == []
+    assert [r["ai_analysis"]["reasoning"] for r in results] == [
+        f"batch:{symbol}" for symbol in SYMBOLS
+    ]
+
+
+@pytest.mark.asyncio
+async def test_batch_entries_resolve_their_own_futures(processor):
+    """Test that each array entry is mapped to the alert at its position."""
+    confidence = {"BTCUSDT": 90, "ETHUSDT": 20, "SOLUSDT": 70}
+    messages, results = await _process(
+        processor,
+        lambda symbols: "Here you go:\n"
+        + json.dumps(
+            [
+                {**_analysis(s, "batch"), "confidence": confidence[s]}
+                for s in symbols
+            ]
+        ),
+    )
+
+    assert [r["ai_analysis"]["reasoning"] for r in results] == [
+        f"batch:{symbol}" for symbol in SYMBOLS
+    ]
+    assert [r["ai_analysis"]["confidence"] for r in results] == [90, 20, 70]
+    # Only the low-confidence alert is rejected
+    assert [r["should_execute"] for r in results] == [True, False, True]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "batch_reply",
+    [
+        pytest.param(lambda symbols: "I can't do that", id="malformed"),
+        pytest.param(
+            lambda symbols: json.dumps([_analysis(symbols[0], "batch")]), id="short"
+        ),
+    ],
+)
+async def test_unusable_batch_response_falls_back_per_alert(processor, batch_reply):
+    """Test that a malformed or short reply is retried one alert at a time."""
+    messages, results = await _process(processor, batch_reply)
+
+    assert messages.batch_calls == [SYMBOLS]
+    assert sorted(messages.single_calls) == sorted(SYMBOLS)
+
+    btc, eth, sol = results
+    assert btc["ai_analysis"]["reasoning"] == "single:BTCUSDT"
+    assert eth["ai_analysis"]["reasoning"] == "single:ETHUSDT"
+    # The alert whose own request failed is handled on its own
+    assert sol["ai_analysis"] is None
+    assert sol["should_execute"] is True
+    assert sol["modified_alert"].symbol == "SOLUSDT"
+
+
+@pytest.mark.asyncio
+async def test_non_object_batch_entries_fall_back_per_alert(processor):
+    """Test that only entries that aren't analyses are retried."""
+    messages, results = await _process(
+        processor,
+        lambda symbols: json.dumps(
+            [_analysis(symbols[0], "batch"), "n/a", _analysis(symbols[2], "batch")]
+        ),
+    )
+
+    assert messages.single_calls == ["ETHUSDT"]
+    assert [r["ai_analysis"]["reasoning"] for r in results] == [
+        "batch:BTCUSDT",
+        "single:ETHUSDT",
+        "batch:SOLUSDT",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_stop_cancels_queued_and_in_flight_alerts(monkeypatch):
+    """Test that stop() resolves every future returned by enqueue()."""
+    monkeypatch.setattr(settings, "ai_webhook_workers", 1)
+    monkeypatch.setattr(settings, "ai_webhook_batch_max", 1)
+
+    started = asyncio.Event()
+
+    async def stuck_batch(batch):
+        started.set()
+        await asyncio.Event().wait()
+
+    processor = AIWebhookProcessor(redis_client=None)
+    monkeypatch.setattr(processor, "_process_batch", stuck_batch)
+
+    alert = TradingViewAlert(
+        strategy="EMA_Crossover", symbol="BTCUSDT", signal="buy", price=50000.0
+    )
+    futures = [await processor.enqueue(alert) for _ in range(3)]
+    await asyncio.wait_for(started.wait(), timeout=1)
+
+    await processor.stop()
+
+    # One alert was in flight, the other two still queued
+    assert all(future.cancelled() for future in futures)
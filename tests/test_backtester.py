@@ -0,0 +1,38 @@
+"""Tests for the backtesting engine."""
+from datetime import datetime
+
+from app.models.backtest import BacktestRequest
+from app.services.backtester import backtester
+from app.services.strategies.ema_crossover import EMACrossoverStrategy
+
+
+def _request(**strategy_params) -> BacktestRequest:
+    return BacktestRequest(
+        strategy="EMA_CROSSOVER",
+        symbol="BTCUSDT",
+        start_date=datetime(2024, 1, 1),
+        end_date=datetime(2024, 2, 1),
+        strategy_params=strategy_params,
+    )
+
+
+def test_ema_strategies_get_their_own_parameters():
+    """Test that strategies built from the same settings don't share parameters."""
+    first = backtester._create_strategy(_request(fast_ema_period=5, slow_ema_period=20))
+    second = backtester._create_strategy(
+        _request(slow_ema_period=20, fast_ema_period=5)
+    )
+
+    assert first.parameters == second.parameters
+    assert first.parameters is not second.parameters
+
+    first.parameters.volume_threshold = 3.0
+    assert second.parameters.volume_threshold == 1.5
+
+
+def test_ema_strategy_with_unhashable_params():
+    """Test that unhashable parameter values don't fail the backtest setup."""
+    strategy = backtester._create_strategy(_request(volume_threshold=[1.5]))
+
+    assert isinstance(strategy, EMACrossoverStrategy)
+    assert strategy.params.volume_threshold == [1.5]
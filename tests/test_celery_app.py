@@ -0,0 +1,60 @@
+"""Tests for the Celery serialization settings."""
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pandas as pd
+from kombu.serialization import dumps, loads, prepare_accept_content
+
+from app.core.celery_app import celery_app
+
+ACCEPT = prepare_accept_content(celery_app.conf.accept_content)
+
+PAYLOAD = {
+    "symbol": "BTCUSDT",
+    "timestamp": datetime(2024, 1, 1, 12, 30, tzinfo=timezone.utc),
+    "bar_time": pd.Timestamp("2024-01-02 00:00:00"),
+    "price": Decimal("50000.5"),
+    "trades": [{"entry_time": datetime(2024, 1, 3, 9, 0)}],
+}
+
+EXPECTED = {
+    "symbol": "BTCUSDT",
+    "timestamp": datetime(2024, 1, 1, 12, 30, tzinfo=timezone.utc),
+    "bar_time": datetime(2024, 1, 2),
+    "price": Decimal("50000.5"),
+    "trades": [{"entry_time": datetime(2024, 1, 3, 9, 0)}],
+}
+
+
+def test_task_messages_round_trip_datetimes():
+    """Test that task arguments holding datetimes survive the task serializer."""
+    serializer = celery_app.conf.task_serializer
+    assert serializer == "msgpack"
+
+    content_type, encoding, body = dumps(((PAYLOAD,), {}, {}), serializer=serializer)
+    args, kwargs, _ = loads(body, content_type, encoding, accept=ACCEPT)
+
+    assert args == [EXPECTED]
+
+
+def test_task_message_via_amqp_round_trip():
+    """Test a full task message built by app.amqp, as apply_async would send it."""
+    message = celery_app.amqp.as_task_v2(
+        "task-id", "app.workers.tasks.process_webhook", args=(PAYLOAD,)
+    )
+    content_type, encoding, body = dumps(
+        message.body, serializer=celery_app.conf.task_serializer
+    )
+    args, _, _ = loads(body, content_type, encoding, accept=ACCEPT)
+
+    assert args == [EXPECTED]
+
+
+def test_results_and_state_meta_round_trip_datetimes():
+    """Test that task results and update_state meta encode datetimes."""
+    backend = celery_app.backend
+    meta = {"status": "SUCCESS", "result": PAYLOAD, "date_done": datetime.now()}
+
+    decoded = backend.decode(backend.encode(meta))
+
+    assert decoded["result"] == EXPECTED
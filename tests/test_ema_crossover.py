@@ -0,0 +1,213 @@
+"""Tests for the EMA crossover strategy and its EMA kernels."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.strategies._ema_loops import _triple_ewm_loop, ema_alpha, triple_ewm
+from app.services.strategies.ema_crossover import (
+    EMACrossoverParameters,
+    EMACrossoverStrategy,
+    get_ema_crossover_strategy,
+)
+
+FAST, SLOW, SIGNAL = 12, 26, 9
+
+
+def _pandas_triple_ewm(close: np.ndarray):
+    """Reference implementation with pandas ewm(span=..., adjust=False)"""
+    series = pd.Series(close)
+    ema_fast = series.ewm(span=FAST, adjust=False).mean()
+    ema_slow = series.ewm(span=SLOW, adjust=False).mean()
+    ema_diff = ema_fast - ema_slow
+    signal_line = ema_diff.ewm(span=SIGNAL, adjust=False).mean()
+    return ema_fast, ema_slow, ema_diff, signal_line
+
+
+def _random_walk(n: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return 100.0 + np.cumsum(rng.normal(0.0, 1.0, n))
+
+
+@pytest.mark.parametrize(
+    "close",
+    [
+        _random_walk(500),
+        np.array([1.0, 2.0, np.nan, 4.0, 5.0, 6.0]),
+        np.concatenate([[np.nan, np.nan], _random_walk(100, seed=1)]),
+    ],
+    ids=["no-nan", "nan-in-middle", "leading-nan"],
+)
+def test_triple_ewm_matches_pandas(close):
+    """Test that triple_ewm matches pandas ewm, with and without NaN closes."""
+    result = triple_ewm(close, ema_alpha(FAST), ema_alpha(SLOW), ema_alpha(SIGNAL))
+    for actual, expected in zip(result, _pandas_triple_ewm(close)):
+        np.testing.assert_allclose(actual, expected.to_numpy(), rtol=1e-12)
+
+
+def test_triple_ewm_loop_matches_pandas():
+    """Test the plain recurrence (what numba compiles) against pandas."""
+    close = _random_walk(500)
+    result = _triple_ewm_loop(
+        close, ema_alpha(FAST), ema_alpha(SLOW), ema_alpha(SIGNAL)
+    )
+    for actual, expected in zip(result, _pandas_triple_ewm(close)):
+        np.testing.assert_allclose(actual, expected.to_numpy(), rtol=1e-12)
+
+
+def test_calculate_indicators_with_nan_close():
+    """Test that NaN closes give well-defined crossover signals."""
+    close = _random_walk(200, seed=2)
+    close[[0, 50, 51]] = np.nan
+    data = pd.DataFrame(
+        {"close": close, "high": close + 1, "low": close - 1, "volume": 1000.0},
+        index=pd.date_range("2024-01-01", periods=len(close), freq="h"),
+    )
+    strategy = EMACrossoverStrategy(
+        EMACrossoverParameters(
+            symbol="BTCUSDT",
+            timeframe="1h",
+            lookback_period=200,
+            use_volume_filter=False,
+        )
+    )
+
+    df = strategy.calculate_indicators(data)
+
+    assert set(np.unique(df["signal"])) <= {-2, -1, 0, 1, 2}
+    assert df["signal"].iat[0] == 0
+    assert not df["ema_fast"].iloc[1:].isna().any()
+
+
+def test_shared_strategy_ignores_keyword_order():
+    """Test that the same parameters in any order share one instance."""
+    first = get_ema_crossover_strategy(
+        "BTCUSDT", "1h", 100, fast_ema_period=5, slow_ema_period=20
+    )
+    second = get_ema_crossover_strategy(
+        "BTCUSDT", "1h", 100, slow_ema_period=20, fast_ema_period=5
+    )
+
+    assert first is second
+
+
+def test_shared_strategy_with_unhashable_params():
+    """Test that unhashable parameter values get an uncached instance."""
+    strategy = get_ema_crossover_strategy("BTCUSDT", "1h", 100, volume_threshold=[1.5])
+
+    assert isinstance(strategy, EMACrossoverStrategy)
+    assert strategy is not get_ema_crossover_strategy(
+        "BTCUSDT", "1h", 100, volume_threshold=[1.5]
+    )
+
+
+def _ohlcv(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = _random_walk(n, seed)
+    return pd.DataFrame(
+        {
+            "close": close,
+            "high": close + rng.uniform(0.1, 1.0, n),
+            "low": close - rng.uniform(0.1, 1.0, n),
+            "volume": rng.lognormal(7.0, 0.6, n),
+        },
+        index=pd.date_range("2024-01-01", periods=n, freq="h"),
+    )
+
+
+def _strategy(use_volume_filter: bool) -> EMACrossoverStrategy:
+    return EMACrossoverStrategy(
+        EMACrossoverParameters(
+            symbol="BTCUSDT",
+            timeframe="1h",
+            lookback_period=100,
+            use_volume_filter=use_volume_filter,
+        )
+    )
+
+
+def _assert_same_signal(actual, expected):
+    if expected is None:
+        assert actual is None
+        return
+    assert actual is not None
+    assert actual.timestamp == expected.timestamp
+    assert actual.direction == expected.direction
+    assert actual.entry_price == expected.entry_price
+    assert actual.stop_loss == pytest.approx(expected.stop_loss)
+    assert actual.take_profit == pytest.approx(expected.take_profit)
+    for key in ("ema_fast", "ema_slow", "ema_diff", "volume_ratio"):
+        assert actual.metadata[key] == pytest.approx(expected.metadata[key])
+
+
+def _counting_recalculations(strategy, monkeypatch):
+    calls = []
+    calculate = strategy.calculate_indicators
+
+    def counted(data):
+        calls.append(len(data))
+        return calculate(data)
+
+    monkeypatch.setattr(strategy, "calculate_indicators", counted)
+    return calls
+
+
+@pytest.mark.parametrize("use_volume_filter", [False, True])
+def test_incremental_signals_match_full_recompute(use_volume_filter, monkeypatch):
+    """Test that growing frames on one instance match a fresh full recompute."""
+    data = _ohlcv(1500, seed=3)
+    live = _strategy(use_volume_filter)
+    recalculations = _counting_recalculations(live, monkeypatch)
+
+    end, step, signals = 60, 0, 0
+    while end <= len(data):
+        frame = data.iloc[:end]
+        expected = _strategy(use_volume_filter).generate_signals(frame)
+        _assert_same_signal(live.generate_signals(frame), expected)
+        signals += expected is not None
+        step += 1
+        end += 1 + step % 3  # one to three new bars per call
+
+    # Only the first call recalculated; every later one advanced the state
+    assert recalculations == [60]
+    assert signals > 0
+
+
+@pytest.mark.parametrize(
+    "next_frame",
+    [
+        pytest.param(
+            lambda data: data.iloc[
+                : 200 + EMACrossoverStrategy.INCREMENTAL_MAX_BARS + 1
+            ],
+            id="too-many-new-bars",
+        ),
+        pytest.param(lambda data: data.iloc[:150], id="shorter-frame"),
+        pytest.param(
+            lambda data: data.iloc[:201].assign(
+                close=lambda df: df["close"].where(
+                    df.index != data.index[199], df["close"] + 5.0
+                )
+            ),
+            id="changed-last-bar",
+        ),
+        pytest.param(
+            lambda data: data.iloc[:203].assign(
+                close=lambda df: df["close"].where(df.index != data.index[201])
+            ),
+            id="nan-in-new-bars",
+        ),
+    ],
+)
+def test_incremental_state_falls_back_to_full_recompute(next_frame, monkeypatch):
+    """Test that frames the cached state can't extend are recalculated."""
+    data = _ohlcv(400, seed=4)
+    live = _strategy(use_volume_filter=False)
+    live.generate_signals(data.iloc[:200])
+    recalculations = _counting_recalculations(live, monkeypatch)
+
+    frame = next_frame(data)
+    expected = _strategy(use_volume_filter=False).generate_signals(frame)
+
+    _assert_same_signal(live.generate_signals(frame), expected)
+    assert recalculations == [len(frame)]
+    assert live._ema_state.length == len(frame)
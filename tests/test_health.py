@@ -1,19 +1,14 @@
 """Basic health check tests for the API."""
+import re
 import pytest
-from fastapi.testclient import TestClient
-from datetime import datetime
-from main import app
 
+_TS_RE = re.compile(r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}")
 
-@pytest.fixture
-def client():
-    """Create test client."""
-    return TestClient(app)
 
-
-def test_health_check(client):
+@pytest.mark.asyncio
+async def test_health_check(aclient):
     """Test the health check endpoint."""
-    response = client.get("/api/v1/health")
+    response = await aclient.get("/api/v1/health")
 
     assert response.status_code == 200
 
@@ -23,14 +18,14 @@ def test_health_check(client):
     assert data["environment"] == "development"
     assert "timestamp" in data
 
-    # Verify timestamp is valid
-    timestamp = datetime.fromisoformat(data["timestamp"])
-    assert isinstance(timestamp, datetime)
+    # Verify timestamp is ISO 8601
+    assert _TS_RE.match(data["timestamp"])
 
 
-def test_status_check(client):
+@pytest.mark.asyncio
+async def test_status_check(aclient):
     """Test the status check endpoint."""
-    response = client.get("/api/v1/status")
+    response = await aclient.get("/api/v1/status")
 
     assert response.status_code == 200
 
@@ -49,25 +44,28 @@ def test_status_check(client):
     assert services["webhooks"] == "active"
 
 
-def test_root_redirect(client):
+@pytest.mark.asyncio
+async def test_root_redirect(aclient):
     """Test that root path returns appropriate response."""
-    response = client.get("/")
+    response = await aclient.get("/")
     # The app doesn't have a root handler, so it should return 404
     assert response.status_code == 404
 
 
-def test_docs_available(client):
+@pytest.mark.asyncio
+async def test_docs_available(aclient):
     """Test that API docs are available in development."""
-    response = client.get("/docs")
+    response = await aclient.get("/docs")
     assert response.status_code == 200
 
-    response = client.get("/redoc")
+    response = await aclient.get("/redoc")
     assert response.status_code == 200
 
 
-def test_openapi_schema(client):
+@pytest.mark.asyncio
+async def test_openapi_schema(aclient):
     """Test that OpenAPI schema is available."""
-    response = client.get("/openapi.json")
+    response = await aclient.get("/openapi.json")
     assert response.status_code == 200
 
     schema = response.json()
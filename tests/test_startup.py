@@ -0,0 +1,26 @@
+"""Startup smoke tests: settings load and all routers are registered."""
+import pytest
+
+
+def test_settings_load(app):
+    """Test that settings parse from the environment and .env."""
+    from app.core.config import settings
+
+    assert app is not None
+    assert isinstance(settings.ibkr_port, int)
+    assert isinstance(settings.backtest_commission, float)
+
+
+@pytest.mark.parametrize(
+    "endpoint",
+    [
+        "/api/v1/auth/register",
+        "/api/v1/profile/risk-assessment",
+        "/api/v1/tasks/backtest",
+        "/api/v1/webhook/tradingview",
+    ],
+)
+def test_routes_registered(app, endpoint):
+    """Test that the refactored routers are included in the app."""
+    paths = {route.path for route in app.routes}
+    assert any(endpoint in path for path in paths)
@@ -0,0 +1,145 @@
+"""Tests for the unified state manager."""
+import pytest
+
+from app.models.base import BaseTradingSignal
+from app.services.state_manager import StateManager, StateType
+
+
+@pytest.fixture
+def manager():
+    """Fresh state manager (not the global singleton)."""
+    return StateManager()
+
+
+@pytest.mark.asyncio
+async def test_failing_listeners_do_not_break_writes(manager):
+    """Test that raising or non-async listeners are logged, not propagated."""
+    calls = []
+
+    def raises(action, entry):
+        raise RuntimeError("listener failed")
+
+    def not_async(action, entry):
+        calls.append(("sync", action))
+
+    async def listener(action, entry):
+        calls.append(("async", action))
+
+    for callback in (raises, not_async, listener):
+        manager.subscribe(StateType.POSITION, callback)
+
+    entry = await manager.create(StateType.POSITION, "p1", {"status": "open"})
+
+    assert await manager.get(StateType.POSITION, "p1") is entry
+    assert calls == [("sync", "create"), ("async", "create")]
+
+
+async def _open_ids(manager, symbol=None):
+    """Open position ids, checking the index holds nothing stale."""
+    ids = [entry.id for entry in await manager.get_open_positions(symbol)]
+    # get_open_positions re-checks status, so look at the raw index as well
+    if symbol:
+        indexed = list(manager._open_positions.get(symbol, ()))
+    else:
+        indexed = [id for group in manager._open_positions.values() for id in group]
+    assert indexed == ids
+    assert all(manager._open_positions.values())  # no empty symbol buckets
+    return ids
+
+
+@pytest.mark.asyncio
+async def test_open_positions_after_create(manager):
+    """Test that created positions are listed in creation order."""
+    signal = BaseTradingSignal(symbol="BTCUSDT", signal="buy", price=50000.0)
+    first = await manager.create_position("BTCUSDT", signal)
+    second = await manager.create_position("BTCUSDT", signal)
+    other = await manager.create(
+        StateType.POSITION, "eth", {"symbol": "ETHUSDT", "status": "open"}
+    )
+    await manager.create(
+        StateType.POSITION, "done", {"symbol": "BTCUSDT", "status": "closed"}
+    )
+
+    assert await _open_ids(manager, "BTCUSDT") == [first.id, second.id]
+    assert await _open_ids(manager, "ETHUSDT") == [other.id]
+    assert await _open_ids(manager) == [first.id, second.id, other.id]
+
+
+@pytest.mark.asyncio
+async def test_open_positions_follow_symbol_update(manager):
+    """Test that changing a position's symbol moves it in the index."""
+    await manager.create(
+        StateType.POSITION, "p1", {"symbol": "BTCUSDT", "status": "open"}
+    )
+
+    await manager.update(StateType.POSITION, "p1", {"symbol": "ETHUSDT"})
+
+    assert await _open_ids(manager, "BTCUSDT") == []
+    assert await _open_ids(manager, "ETHUSDT") == ["p1"]
+    assert await _open_ids(manager) == ["p1"]
+
+
+@pytest.mark.asyncio
+async def test_close_position_leaves_open_index(manager):
+    """Test that closed positions are no longer open."""
+    await manager.create(
+        StateType.POSITION, "p1", {"symbol": "BTCUSDT", "status": "open"}
+    )
+    await manager.create(
+        StateType.POSITION, "p2", {"symbol": "BTCUSDT", "status": "open"}
+    )
+
+    closed = await manager.close_position("p1")
+
+    assert closed.data["status"] == "closed"
+    assert await _open_ids(manager, "BTCUSDT") == ["p2"]
+    assert await _open_ids(manager) == ["p2"]
+
+
+@pytest.mark.asyncio
+async def test_delete_position_leaves_open_index(manager):
+    """Test that deleted positions are no longer open."""
+    await manager.create(
+        StateType.POSITION, "p1", {"symbol": "BTCUSDT", "status": "open"}
+    )
+
+    assert await manager.delete(StateType.POSITION, "p1")
+
+    assert await _open_ids(manager, "BTCUSDT") == []
+    assert await _open_ids(manager) == []
+
+
+@pytest.mark.asyncio
+async def test_clear_positions_empties_open_index(manager):
+    """Test that clearing positions resets the index."""
+    await manager.create(
+        StateType.POSITION, "p1", {"symbol": "BTCUSDT", "status": "open"}
+    )
+    await manager.create(
+        StateType.POSITION, "p2", {"symbol": "ETHUSDT", "status": "open"}
+    )
+
+    assert await manager.clear(StateType.POSITION) == 2
+    assert await _open_ids(manager) == []
+
+    # Positions created afterwards are indexed again
+    await manager.create(
+        StateType.POSITION, "p1", {"symbol": "BTCUSDT", "status": "open"}
+    )
+    assert await _open_ids(manager) == ["p1"]
+
+
+@pytest.mark.asyncio
+async def test_upsert_existing_position_reindexes(manager):
+    """Test that upserting a position keeps the index in sync."""
+    await manager.upsert(
+        StateType.POSITION, "p1", {"symbol": "BTCUSDT", "status": "open"}
+    )
+    assert await _open_ids(manager, "BTCUSDT") == ["p1"]
+
+    await manager.upsert(StateType.POSITION, "p1", {"symbol": "ETHUSDT"})
+    assert await _open_ids(manager, "BTCUSDT") == []
+    assert await _open_ids(manager, "ETHUSDT") == ["p1"]
+
+    await manager.upsert(StateType.POSITION, "p1", {"status": "closed"})
+    assert await _open_ids(manager) == []